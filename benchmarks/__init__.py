@@ -0,0 +1 @@
+"""Benchmarks for the mizue package. These are not shipped with the distribution."""
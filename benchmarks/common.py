@@ -0,0 +1,139 @@
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def get_package_version() -> str:
+    """Returns the installed version of mizue, or the version in setup.py when running from a checkout"""
+    try:
+        from importlib.metadata import version
+        return version("mizue")
+    except Exception:
+        setup_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "setup.py")
+        if os.path.exists(setup_path):
+            with open(setup_path, "r") as f:
+                for line in f:
+                    if line.strip().startswith("version="):
+                        return line.split("=", 1)[1].strip().strip(",").strip("\"'")
+        return "unknown"
+
+
+def get_peak_rss_kb() -> int | None:
+    """Returns the peak resident set size of the current process in kilobytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Returns the given percentile of a list of values using linear interpolation"""
+    if len(values) == 0:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float | None]:
+    """Returns the p50/p90/p99/max summary of a list of latencies in seconds, converted to milliseconds"""
+    milliseconds = [latency * 1000 for latency in latencies]
+    return {
+        "p50_ms": percentile(milliseconds, 50),
+        "p90_ms": percentile(milliseconds, 90),
+        "p99_ms": percentile(milliseconds, 99),
+        "max_ms": max(milliseconds) if milliseconds else None,
+    }
+
+
+@dataclass
+class Measurement:
+    """Wall clock and CPU time of a measured block. Use it as a context manager."""
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+    def __enter__(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+
+
+def save_results(path: str, suite: str, results: dict, label: str | None = None) -> dict:
+    """
+    Save benchmark results as JSON together with the environment they were measured in
+    :param path: The output file
+    :param suite: The name of the benchmark suite
+    :param results: The results of every scenario, keyed by scenario name
+    :param label: An optional label to identify the run (e.g. a branch name)
+    :return: The saved document
+    """
+    document = {
+        "suite": suite,
+        "label": label,
+        "version": get_package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+    return document
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def print_comparison(baseline: dict, current: dict, metrics: list[str]) -> None:
+    """
+    Print a comparison of two result documents saved by save_results()
+    :param baseline: The baseline results
+    :param current: The current results
+    :param metrics: The names of the metrics to compare
+    """
+    from mizue.printer.grid import Alignment, ColumnSettings, Grid
+
+    rows = []
+    for scenario, current_result in current["results"].items():
+        baseline_result = baseline["results"].get(scenario, {})
+        for metric in metrics:
+            old, new = baseline_result.get(metric), current_result.get(metric)
+            if old is None and new is None:
+                continue
+            change = f"{(new - old) * 100 / old:+.1f}%" if old and new is not None else "n/a"
+            rows.append([scenario, metric, _format_number(old), _format_number(new), change])
+
+    columns = [
+        ColumnSettings(title="Scenario"),
+        ColumnSettings(title="Metric"),
+        ColumnSettings(title=baseline.get("label") or baseline["version"], alignment=Alignment.RIGHT),
+        ColumnSettings(title=current.get("label") or current["version"], alignment=Alignment.RIGHT),
+        ColumnSettings(title="Change", alignment=Alignment.RIGHT),
+    ]
+    Grid(columns, rows).print()
+
+
+def _format_number(value: float | None) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,232 @@
+"""
+Downloader benchmark suite.
+
+Runs a set of download scenarios against a local BenchmarkServer and records throughput, CPU time per MB,
+peak RSS and per-file completion latency. Results are saved as JSON so that runs of different versions can be
+compared with --compare.
+
+    python -m benchmarks.downloader_benchmark --output results/current.json
+    python -m benchmarks.downloader_benchmark --output results/new.json --compare results/current.json
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from benchmarks.common import Measurement, get_package_version, get_peak_rss_kb, latency_summary, load_results, \
+    print_comparison, save_results
+from benchmarks.server import BenchmarkServer, build_url
+
+KB = 1024
+MB = 1024 * 1024
+
+
+@dataclass
+class Scenario:
+    name: str
+    file_count: int
+    size: int
+    mode: str = "sequential"
+    """One of 'sequential', 'parallel' (Downloader on a thread pool) or 'tool' (DownloaderTool.download_list)"""
+
+    parallel: int = 1
+    options: dict[str, int] = field(default_factory=dict)
+    """Response options passed to the server for every file"""
+
+    error_every: int = 0
+    """Every n-th file responds with HTTP 500"""
+
+    disconnect_every: int = 0
+    """Every n-th file is disconnected half-way through"""
+
+    slow_mirror_every: int = 0
+    """If set, every file gets a second mirror and the first mirror of every n-th file responds after one second"""
+
+    hedge: bool = False
+    """Whether to send hedged requests to the second mirror"""
+
+    adaptive: bool = False
+    """Whether to adjust the number of parallel downloads at runtime, up to the parallel value ('tool' mode only)"""
+
+
+SCENARIOS = [
+    Scenario("single_large", file_count=1, size=64 * MB),
+    Scenario("bulk_small", file_count=200, size=64 * KB),
+    Scenario("parallel_small", file_count=200, size=64 * KB, mode="parallel", parallel=8),
+    Scenario("parallel_latency", file_count=100, size=256 * KB, mode="parallel", parallel=8,
+             options={"latency": 50}),
+    Scenario("parallel_throttled", file_count=8, size=1 * MB, mode="parallel", parallel=4,
+             options={"rate": 2 * MB}),
+    Scenario("no_content_length", file_count=20, size=1 * MB, mode="parallel", parallel=4, options={"length": 0}),
+    Scenario("faults", file_count=100, size=64 * KB, mode="parallel", parallel=8, error_every=10,
+             disconnect_every=17),
+    Scenario("slow_mirrors", file_count=100, size=64 * KB, mode="parallel", parallel=8, slow_mirror_every=10),
+    Scenario("slow_mirrors_hedged", file_count=100, size=64 * KB, mode="parallel", parallel=8, slow_mirror_every=10,
+             hedge=True),
+    Scenario("tool_bulk", file_count=100, size=256 * KB, mode="tool", parallel=8),
+    Scenario("tool_throttled_fixed", file_count=200, size=256 * KB, mode="tool", parallel=16,
+             options={"latency": 20, "rate": 4 * MB, "limit": 6}),
+    Scenario("tool_throttled_adaptive", file_count=200, size=256 * KB, mode="tool", parallel=16, adaptive=True,
+             options={"latency": 20, "rate": 4 * MB, "limit": 6}),
+]
+
+
+def build_urls(scenario: Scenario, base_url: str) -> list[str | list[str]]:
+    urls = []
+    for index in range(scenario.file_count):
+        filename = f"{scenario.name}_{index:05d}.bin"
+        options = dict(scenario.options)
+        if scenario.error_every and index % scenario.error_every == scenario.error_every - 1:
+            options["status"] = 500
+        elif scenario.disconnect_every and index % scenario.disconnect_every == scenario.disconnect_every - 1:
+            options["disconnect"] = scenario.size // 2
+        if scenario.slow_mirror_every:
+            primary_options = dict(options)
+            if index % scenario.slow_mirror_every == scenario.slow_mirror_every - 1:
+                primary_options["latency"] = 1000
+            urls.append([build_url(base_url, filename, scenario.size, **primary_options),
+                         build_url(base_url, filename, scenario.size, mirror=1, **options)])
+        else:
+            urls.append(build_url(base_url, filename, scenario.size, **options))
+    return urls
+
+
+def run_scenario(scenario: Scenario, base_url: str) -> dict:
+    """
+    Run a scenario in the current process and return its metrics
+    :param scenario: The scenario to run
+    :param base_url: The base URL of a running BenchmarkServer
+    :return: The metrics of the scenario
+    """
+    from mizue.network.downloader import ConcurrencyController, Downloader, DownloaderTool, DownloadEventType
+
+    urls = build_urls(scenario, base_url)
+    output_path = tempfile.mkdtemp(prefix=f"mizue-bench-{scenario.name}-")
+    latencies: list[float] = []
+    completed = []
+    failures = []
+
+    def timed_download(downloader: Downloader, url: str | list[str]):
+        started = time.perf_counter()
+        try:
+            downloader.download(url, output_path)
+        except Exception:
+            pass  # The downloader has already fired a failure event
+        latencies.append(time.perf_counter() - started)
+
+    error = None
+    controller = ConcurrencyController(max_parallel=scenario.parallel, interval=0.25) if scenario.adaptive else None
+    try:
+        with Measurement() as measurement, contextlib.redirect_stdout(io.StringIO()):
+            if scenario.mode == "tool":
+                tool = DownloaderTool()
+                tool.display_report = False
+                tool.hedge = scenario.hedge
+                # The tool reports every entry once, after its retries, like the downloader in the other modes
+                tool.add_event(DownloadEventType.COMPLETED, lambda event: completed.append(event))
+                tool.add_event(DownloadEventType.FAILED, lambda event: failures.append(event))
+                tool.download_list(urls, output_path, controller or scenario.parallel)
+            else:
+                downloader = Downloader()
+                downloader.hedge = scenario.hedge
+                downloader.add_event(DownloadEventType.COMPLETED, lambda event: completed.append(event))
+                downloader.add_event(DownloadEventType.FAILED, lambda event: failures.append(event))
+                if scenario.mode == "parallel":
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=scenario.parallel) as executor:
+                        for url in urls:
+                            executor.submit(timed_download, downloader, url)
+                else:
+                    for url in urls:
+                        timed_download(downloader, url)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    downloaded_files = os.listdir(output_path)
+    downloaded_bytes = sum(os.path.getsize(os.path.join(output_path, f)) for f in downloaded_files)
+    shutil.rmtree(output_path, ignore_errors=True)
+
+    megabytes = downloaded_bytes / MB
+    result = {
+        "files": scenario.file_count,
+        "completed": len(completed),
+        "failed": len(failures),
+        "bytes": downloaded_bytes,
+        "wall_seconds": measurement.wall_seconds,
+        "throughput_mb_s": megabytes / measurement.wall_seconds if measurement.wall_seconds > 0 else None,
+        "cpu_seconds": measurement.cpu_seconds,
+        "cpu_ms_per_mb": measurement.cpu_seconds * 1000 / megabytes if megabytes > 0 else None,
+        "peak_rss_kb": get_peak_rss_kb(),
+        **latency_summary(latencies),
+    }
+    if controller is not None:
+        result["final_parallel"] = controller.limit
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def _run_scenario_in_child(scenario: Scenario, base_url: str, result_queue: multiprocessing.Queue):
+    result_queue.put(run_scenario(scenario, base_url))
+
+
+def run_scenario_isolated(scenario: Scenario, base_url: str) -> dict:
+    """Run a scenario in a fresh process, so that CPU time and peak RSS are not shared between scenarios"""
+    result_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_scenario_in_child, args=(scenario, base_url, result_queue))
+    process.start()
+    result = result_queue.get()
+    process.join()
+    return result
+
+
+def quick(scenario: Scenario) -> Scenario:
+    """Returns a smaller version of a scenario for smoke runs"""
+    return Scenario(scenario.name, max(1, scenario.file_count // 10), max(KB, scenario.size // 8), scenario.mode,
+                    scenario.parallel, dict(scenario.options), scenario.error_every, scenario.disconnect_every,
+                    scenario.slow_mirror_every, scenario.hedge, scenario.adaptive)
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark mizue downloads against a local HTTP server")
+    parser.add_argument("--output", default=None,
+                        help="The JSON file to write the results to (default: benchmarks/results/downloader-<version>.json)")
+    parser.add_argument("--scenario", action="append", default=None,
+                        help="Run only the given scenario (can be repeated)")
+    parser.add_argument("--quick", action="store_true", help="Run smaller versions of the scenarios")
+    parser.add_argument("--label", default=None, help="A label to identify this run in comparisons")
+    parser.add_argument("--compare", default=None, help="A previous result file to compare against")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="Run the scenarios and the server in the current process")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if args.scenario is None or s.name in args.scenario]
+    if args.quick:
+        scenarios = [quick(s) for s in scenarios]
+
+    results = {}
+    with BenchmarkServer(isolated=not args.no_isolate) as server:
+        for scenario in scenarios:
+            print(f"Running {scenario.name}...", file=sys.stderr)
+            results[scenario.name] = run_scenario(scenario, server.base_url) if args.no_isolate \
+                else run_scenario_isolated(scenario, server.base_url)
+
+    output = args.output or os.path.join(os.path.dirname(__file__), "results",
+                                         f"downloader-{get_package_version()}.json")
+    document = save_results(output, "downloader", results, args.label)
+    print(f"Results saved to {output}", file=sys.stderr)
+
+    if args.compare:
+        print_comparison(load_results(args.compare), document,
+                         ["throughput_mb_s", "cpu_ms_per_mb", "peak_rss_kb", "p50_ms", "p99_ms"])
+    return document
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+File listing benchmark.
+
+Builds a temporary directory tree and measures how long listing it takes with the os.walk and os.listdir based
+listings that FileUtils used before, with FileWalker in the calling thread and with a thread pool, and with filters.
+The time to the first result shows how soon a streaming walk can be consumed.
+Results are saved as JSON so that runs of different versions can be compared with --compare.
+
+    python -m benchmarks.file_benchmark --output results/current.json
+    python -m benchmarks.file_benchmark --output results/new.json --compare results/current.json
+    python -m benchmarks.file_benchmark --root /path/to/a/large/tree
+"""
+import argparse
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from typing import Callable
+
+from benchmarks.common import get_package_version, load_results, print_comparison, save_results
+
+_EXTENSIONS = [".txt", ".jpg", ".py", ".json", ".log"]
+
+
+def build_tree(root: str, depth: int, folders: int, files: int) -> int:
+    """
+    Build a deterministic directory tree
+    :param depth: The number of folder levels below the root
+    :param folders: The number of subfolders of every folder
+    :param files: The number of files in every folder
+    :return: The number of files created
+    """
+    count = 0
+    for index in range(files):
+        with open(os.path.join(root, f"file_{index}{_EXTENSIONS[index % len(_EXTENSIONS)]}"), "wb") as file:
+            file.write(b"x" * ((index * 97) % 4096))
+        count += 1
+    if depth > 0:
+        for index in range(folders):
+            folder = os.path.join(root, f"folder_{index}")
+            os.mkdir(folder)
+            count += build_tree(folder, depth - 1, folders, files)
+    return count
+
+
+def _os_walk(root: str) -> Iterator[str]:
+    return (os.path.join(dp, f) for dp, dn, filenames in os.walk(root) for f in filenames)
+
+
+def _os_walk_filtered(root: str) -> Iterator[str]:
+    for dp, dn, filenames in os.walk(root):
+        for f in filenames:
+            path = os.path.join(dp, f)
+            if f.endswith(".txt") and os.path.getsize(path) >= 1024:
+                yield path
+
+
+def _listdir(root: str) -> Iterator[str]:
+    return (os.path.join(root, f) for f in os.listdir(root) if os.path.isfile(os.path.join(root, f)))
+
+
+def _walker(workers: int = 0, filtered: bool = False, recursive: bool = True) -> Callable[[str], Iterator[str]]:
+    from mizue.file import FileWalker
+
+    def walk(root: str) -> Iterator[str]:
+        walker = FileWalker()
+        walker.recursive = recursive
+        walker.workers = workers
+        if filtered:
+            walker.extensions = [".txt"]
+            walker.min_size = 1024
+        return walker.walk(root)
+    return walk
+
+
+def _cases(workers: int) -> dict[str, Callable[[str], Iterator[str]]]:
+    return {
+        "os_walk": _os_walk,
+        "walker": _walker(),
+        f"walker_{workers}_workers": _walker(workers),
+        "os_walk_filtered": _os_walk_filtered,
+        "walker_filtered": _walker(filtered=True),
+        f"walker_filtered_{workers}_workers": _walker(workers, filtered=True),
+        "listdir_flat": _listdir,
+        "walker_flat": _walker(recursive=False),
+    }
+
+
+def run_case(function: Callable[[str], Iterator[str]], root: str, repeat: int) -> dict:
+    """
+    Measure the time to list a tree, and to get its first path
+    :param function: A function that returns the paths of a tree
+    :return: The metrics of the case
+    """
+    best = float("inf")
+    best_first = float("inf")
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        paths = function(root)
+        list(itertools.islice(paths, 1))
+        best_first = min(best_first, time.perf_counter() - started)
+        if hasattr(paths, "close"):
+            paths.close()
+
+        started = time.perf_counter()
+        count = sum(1 for _ in function(root))
+        best = min(best, time.perf_counter() - started)
+    return {
+        "paths": count,
+        "seconds": best,
+        "paths_per_second": count / best if best > 0 else None,
+        "first_path_ms": best_first * 1000,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark mizue file listing")
+    parser.add_argument("--output", default=None,
+                        help="The JSON file to write the results to (default: benchmarks/results/file-<version>.json)")
+    parser.add_argument("--root", default=None, help="An existing tree to list instead of a generated one")
+    parser.add_argument("--depth", type=int, default=3, help="The number of folder levels of the generated tree")
+    parser.add_argument("--folders", type=int, default=8, help="The number of subfolders of every generated folder")
+    parser.add_argument("--files", type=int, default=50, help="The number of files in every generated folder")
+    parser.add_argument("--workers", type=int, default=4, help="The number of threads of the parallel walks")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of repetitions (the best one is kept)")
+    parser.add_argument("--label", default=None, help="A label to identify this run in comparisons")
+    parser.add_argument("--compare", default=None, help="A previous result file to compare against")
+    args = parser.parse_args(argv)
+
+    root = args.root
+    temporary_root = None
+    if root is None:
+        temporary_root = root = tempfile.mkdtemp(prefix="mizue-file-benchmark-")
+        print("Building the tree...", file=sys.stderr)
+        count = build_tree(root, args.depth, args.folders, args.files)
+        print(f"Created {count} files", file=sys.stderr)
+
+    try:
+        results = {}
+        for name, function in _cases(args.workers).items():
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = run_case(function, root, args.repeat)
+    finally:
+        if temporary_root is not None:
+            shutil.rmtree(temporary_root, ignore_errors=True)
+
+    output = args.output or os.path.join(os.path.dirname(__file__), "results", f"file-{get_package_version()}.json")
+    document = save_results(output, "file", results, args.label)
+    print(f"Results saved to {output}", file=sys.stderr)
+
+    if args.compare:
+        print_comparison(load_results(args.compare), document, ["paths_per_second", "first_path_ms"])
+    return document
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Grid benchmark suite.
+
+Measures column sizing and rendering throughput of Grid for ASCII, CJK and emoji-heavy tables, with and without
+colored cells, and with row-oriented and column-oriented (dict of lists) data. Results are saved as JSON so that runs of different versions can be compared with --compare.
+With --workers, the colored tables are also rendered with a process pool of that many workers.
+
+    python -m benchmarks.grid_benchmark --output results/current.json
+    python -m benchmarks.grid_benchmark --output results/new.json --compare results/current.json
+    python -m benchmarks.grid_benchmark --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.common import get_package_version, load_results, print_comparison, save_results
+
+os.environ.setdefault("COLUMNS", "160")
+
+_WORDS = {
+    "ascii": ["report", "download", "archive", "image", "document", "backup", "release", "invoice"],
+    "cjk": ["報告書", "ダウンロード", "아카이브", "画像", "文書", "백업", "发布", "請求書"],
+    "emoji": ["📄 report", "⬇️ download", "🗄️ archive", "🖼️ image", "📝 doc", "💾 backup", "🚀 release", "🧾 bill"],
+}
+
+
+def build_rows(kind: str, count: int) -> list[list[str]]:
+    """Build a deterministic table of the given kind"""
+    words = _WORDS[kind]
+    rows = []
+    for index in range(count):
+        name = f"{words[index % len(words)]}_{words[(index * 7) % len(words)]}_{index}"
+        rows.append([str(index + 1), name, words[(index * 3) % len(words)], f"{(index * 37) % 100000 / 10:.2f} KB"])
+    return rows
+
+
+def _build_columns():
+    from mizue.printer.grid import Alignment, ColumnSettings
+    return [
+        ColumnSettings(title="#", alignment=Alignment.RIGHT),
+        ColumnSettings(title="Name"),
+        ColumnSettings(title="Type", alignment=Alignment.CENTER),
+        ColumnSettings(title="Size", alignment=Alignment.RIGHT),
+    ]
+
+
+def _colored_renderer(args):
+    from mizue.printer import Printer
+    return Printer.format_hex(args.cell, "#FFCC75" if args.is_header else "#00A9FF")
+
+
+def _best_of(repeat: int, function) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_case(kind: str, colored: bool, columnar: bool, row_count: int, repeat: int, workers: int = 0) -> dict:
+    """
+    Measure the sizing and rendering time of a table
+    :param workers: The number of processes rendering the cells, or 0 to render them in the current thread
+    :return: The metrics of the case
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from mizue.printer import ColorMode, Terminal
+    from mizue.printer.grid import BorderStyle, Grid
+
+    Terminal.set_color_mode(ColorMode.TRUECOLOR)  # Measure the colors even when the output is not a terminal
+
+    rows = build_rows(kind, row_count)
+    if columnar:
+        rows = {str(index): list(values) for index, values in enumerate(zip(*rows))}
+    columns = _build_columns()
+    grid = Grid(columns, rows)
+    grid.border_style = BorderStyle.SINGLE
+    if colored:
+        grid.border_color = "#FFCC75"
+        grid.cell_renderer = _colored_renderer
+    else:
+        grid.cell_renderer = lambda args: args.cell
+
+    sizing_seconds = _best_of(repeat, lambda: Grid(columns, rows))
+    if workers > 0:
+        with ProcessPoolExecutor(workers) as executor:
+            grid.render_executor = executor
+            grid._buffer()  # Start the workers
+            render_seconds = _best_of(repeat, grid._buffer)
+    else:
+        render_seconds = _best_of(repeat, grid._buffer)
+    return {
+        "rows": row_count,
+        "sizing_ms": sizing_seconds * 1000,
+        "render_ms": render_seconds * 1000,
+        "rows_per_second": row_count / render_seconds if render_seconds > 0 else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark mizue Grid sizing and rendering")
+    parser.add_argument("--output", default=None,
+                        help="The JSON file to write the results to (default: benchmarks/results/grid-<version>.json)")
+    parser.add_argument("--rows", type=int, default=20000, help="The number of rows of every table")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of repetitions (the best one is kept)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Also render the colored tables with a process pool of this many workers")
+    parser.add_argument("--label", default=None, help="A label to identify this run in comparisons")
+    parser.add_argument("--compare", default=None, help="A previous result file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for kind in _WORDS.keys():
+        for colored, columnar in ((False, False), (True, False), (False, True)):
+            name = f"{kind}_{'colored' if colored else 'columnar' if columnar else 'plain'}"
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = run_case(kind, colored, columnar, args.rows, args.repeat)
+        if args.workers > 0:
+            name = f"{kind}_colored_parallel"
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = run_case(kind, True, False, args.rows, args.repeat, args.workers)
+
+    output = args.output or os.path.join(os.path.dirname(__file__), "results", f"grid-{get_package_version()}.json")
+    document = save_results(output, "grid", results, args.label)
+    print(f"Results saved to {output}", file=sys.stderr)
+
+    if args.compare:
+        print_comparison(load_results(args.compare), document, ["sizing_ms", "render_ms", "rows_per_second"])
+    return document
+
+
+if __name__ == "__main__":
+    main()
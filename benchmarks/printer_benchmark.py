@@ -0,0 +1,113 @@
+"""
+Printer microbenchmark.
+
+Measures how many colored strings per second Printer formats, with the few repeated colors that Grid and Progress use,
+in every color mode (24-bit, 256 colors, 16 colors and no colors).
+Results are saved as JSON so that runs of different versions can be compared with --compare.
+
+    python -m benchmarks.printer_benchmark --output results/current.json
+    python -m benchmarks.printer_benchmark --output results/new.json --compare results/current.json
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.common import get_package_version, load_results, print_comparison, save_results
+
+_COLORS = ["#FF0D0D", "#FF4E11", "#FF8E15", "#FAB733", "#ACB334", "#69B34C", "#0EB33B", "#FFCC75"]
+
+
+def _format_hex(count: int) -> None:
+    from mizue.printer import Printer
+    for index in range(count):
+        Printer.format_hex("text", _COLORS[index & 7])
+
+
+def _format_hex_background(count: int) -> None:
+    from mizue.printer import Printer
+    for index in range(count):
+        Printer.format_hex("text", _COLORS[index & 7], _COLORS[(index + 1) & 7], bold=True, underlined=True)
+
+
+def _format_rgb(count: int) -> None:
+    from mizue.printer import Printer
+    colors = [Printer.hex_to_rgb(color) for color in _COLORS]
+    for index in range(count):
+        Printer.format_rgb("text", colors[index & 7])
+
+
+def _colored_progress(count: int) -> None:
+    from mizue.progress.colorful_progress import ColorfulProgress
+    for index in range(count):
+        ColorfulProgress.get_basic_colored_text("text", index % 100)
+
+
+_CASES = {
+    "format_hex": _format_hex,
+    "format_hex_background": _format_hex_background,
+    "format_rgb": _format_rgb,
+    "colored_progress": _colored_progress,
+}
+
+
+_MODES = {
+    "truecolor": "TRUECOLOR",
+    "256": "COLORS_256",
+    "16": "COLORS_16",
+    "none": "NONE",
+}
+
+
+def run_case(name: str, mode: str, count: int, repeat: int) -> dict:
+    """
+    Measure the throughput of a case
+    :param mode: The color mode, one of the keys of _MODES
+    :return: The metrics of the case
+    """
+    from mizue.printer import ColorMode, Terminal
+
+    Terminal.set_color_mode(ColorMode[_MODES[mode]])
+    function = _CASES[name]
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(count)
+        best = min(best, time.perf_counter() - started)
+    return {
+        "count": count,
+        "seconds": best,
+        "strings_per_second": count / best if best > 0 else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark mizue Printer formatting")
+    parser.add_argument("--output", default=None,
+                        help="The JSON file to write the results to (default: benchmarks/results/printer-<version>.json)")
+    parser.add_argument("--count", type=int, default=200000, help="The number of strings formatted by every case")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of repetitions (the best one is kept)")
+    parser.add_argument("--label", default=None, help="A label to identify this run in comparisons")
+    parser.add_argument("--compare", default=None, help="A previous result file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in _MODES.keys():
+        for name in _CASES.keys():
+            print(f"Running {name} ({mode})...", file=sys.stderr)
+            results[name if mode == "truecolor" else f"{name}_{mode}"] = run_case(name, mode, args.count, args.repeat)
+
+    from mizue.printer import Terminal
+    Terminal.set_color_mode()
+
+    output = args.output or os.path.join(os.path.dirname(__file__), "results", f"printer-{get_package_version()}.json")
+    document = save_results(output, "printer", results, args.label)
+    print(f"Results saved to {output}", file=sys.stderr)
+
+    if args.compare:
+        print_comparison(load_results(args.compare), document, ["strings_per_second"])
+    return document
+
+
+if __name__ == "__main__":
+    main()
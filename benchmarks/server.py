@@ -0,0 +1,217 @@
+import multiprocessing
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_PATTERN_PERIOD = 251
+_WRITE_SIZE = 64 * 1024
+_PATTERN = bytes(i % _PATTERN_PERIOD for i in range(_WRITE_SIZE + _PATTERN_PERIOD))
+
+
+def build_url(base_url: str, filename: str, size: int, **options: int) -> str:
+    """
+    Build the URL of a file served by BenchmarkServer with the given options
+    :param base_url: The base URL of the server
+    :param filename: The file name at the end of the URL
+    :param size: The size of the file in bytes
+    :param options: Other response options (see the BenchmarkServer documentation)
+    :return: The URL
+    """
+    encoded_options = ",".join(f"{key}={int(value)}" for key, value in {"size": size, **options}.items())
+    return f"{base_url}/{encoded_options}/{urllib.parse.quote(filename)}"
+
+
+def payload(offset: int, length: int) -> bytes:
+    """
+    Returns the deterministic payload bytes served for the given byte range.
+    The content only depends on the offset, so partial and ranged responses can be verified against each other.
+    :param offset: The offset of the first byte
+    :param length: The number of bytes to return (at most 64 KiB)
+    :return: The payload bytes
+    """
+    start = offset % _PATTERN_PERIOD
+    return _PATTERN[start:start + length]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        options = self._parse_options()
+        with self.server.lock:
+            self.server.request_count += 1
+            self.server.active_count += 1
+            active_count = self.server.active_count
+        try:
+            self._respond(options, active_count)
+        finally:
+            with self.server.lock:
+                self.server.active_count -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, options: dict[str, int], active_count: int):
+        latency = options.get("latency", 0)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+        status = options.get("status", 200)
+        if 0 < options.get("limit", 0) < active_count:
+            status = 429
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+
+        size = options.get("size", 0)
+        start, end = 0, size
+        range_header = self.headers.get("Range")
+        if options.get("ranges", 0) and range_header and range_header.startswith("bytes="):
+            first, _, last = range_header[len("bytes="):].partition("-")
+            start = int(first) if first else 0
+            end = int(last) + 1 if last else size
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Type", "application/octet-stream")
+        if options.get("ranges", 0):
+            self.send_header("Accept-Ranges", "bytes")
+        if options.get("length", 1):
+            self.send_header("Content-Length", str(end - start))
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self._write_body(start, end, options.get("rate", 0), options.get("disconnect", -1))
+
+    def _parse_options(self) -> dict[str, int]:
+        segments = urllib.parse.urlparse(self.path).path.strip("/").split("/")
+        options = {}
+        if len(segments) > 1:
+            for option in segments[0].split(","):
+                key, _, value = option.partition("=")
+                if key:
+                    options[key] = int(value)
+        return options
+
+    def _write_body(self, start: int, end: int, rate: int, disconnect: int):
+        offset = start
+        began = time.perf_counter()
+        try:
+            while offset < end:
+                length = min(_WRITE_SIZE, end - offset)
+                if rate > 0:
+                    length = min(length, max(1, rate // 10))
+                if 0 <= disconnect < offset + length:
+                    self.wfile.write(payload(offset, disconnect - offset))
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload(offset, length))
+                offset += length
+                if rate > 0:
+                    delay = (offset - start) / rate - (time.perf_counter() - began)
+                    if delay > 0:
+                        time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, request_handler_class):
+        super().__init__(server_address, request_handler_class)
+        self.active_count = 0
+        self.lock = threading.Lock()
+        self.request_count = 0
+
+    def handle_error(self, request, client_address):
+        # Clients abort connections on purpose (cancellations, slow transfer aborts, hedged requests),
+        # so only the unexpected errors are reported
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _serve(port_queue: multiprocessing.Queue):
+    server = _Server(("127.0.0.1", 0), _RequestHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class BenchmarkServer:
+    """
+    A deterministic local HTTP server for benchmarking downloads.
+
+    The behaviour of every response is encoded in the first path segment of the URL as comma-separated
+    ``key=value`` pairs, followed by the file name. Use the url() method to build these URLs.
+
+    Supported options:
+        - ``size``: The size of the response body in bytes
+        - ``latency``: Delay in milliseconds before the response headers are sent
+        - ``rate``: Bandwidth limit in bytes per second (0 means unlimited)
+        - ``length``: Set to 0 to omit the Content-Length header
+        - ``ranges``: Set to 1 to honor Range requests
+        - ``status``: Respond with this status code and an empty body instead of the file
+        - ``disconnect``: Close the connection after sending this many bytes
+        - ``limit``: Respond with 429 while more than this many requests are being served
+    """
+
+    def __init__(self, isolated: bool = True):
+        """
+        :param isolated: Whether to run the server in a separate process, so that its CPU time and memory usage
+            are not attributed to the process being measured
+        """
+        self._isolated = isolated
+        self._process: multiprocessing.Process | None = None
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+        self.port = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> None:
+        """Start serving requests"""
+        if self._isolated:
+            port_queue = multiprocessing.Queue()
+            self._process = multiprocessing.Process(target=_serve, args=(port_queue,), daemon=True)
+            self._process.start()
+            self.port = port_queue.get(timeout=10)
+        else:
+            self._server = _Server(("127.0.0.1", 0), _RequestHandler)
+            self.port = self._server.server_address[1]
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests"""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def url(self, filename: str, size: int, **options: int) -> str:
+        """Build the URL of a file served with the given options"""
+        return build_url(self.base_url, filename, size, **options)
@@ -1,3 +1,4 @@
+from .file_walker import FileWalker
 from .fileutils import FileUtils
 
-__all__ = ["FileUtils"]
+__all__ = ["FileUtils", "FileWalker"]
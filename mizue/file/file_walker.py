@@ -0,0 +1,161 @@
+import fnmatch
+import os
+import re
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+_MAX_PENDING_DIRECTORIES_PER_WORKER = 4
+
+
+class FileWalker:
+    """
+    Walks a directory tree lazily with os.scandir.
+
+    Paths are yielded while the tree is being read, so the first results arrive immediately, and iteration can
+    be stopped at any time (e.g. with break or itertools.islice), which stops the walk. The type of each entry comes
+    from its DirEntry, so entries are not stat'ed again, and their size is only read when a size filter is set.
+    The filters are applied during the walk, and the excluded folders are not entered at all.
+    The serial walk visits the folders in the same order as os.walk. With workers, the folders are read in parallel
+    by a thread pool, and the paths are yielded in no particular order.
+    """
+
+    def __init__(self):
+        self.exclude_folders: list[str] | None = None
+        """Glob patterns of the names of the folders that are not entered (e.g. ['.git', 'node_modules'])"""
+
+        self.extensions: list[str] | None = None
+        """The endings of the names of the files to yield (e.g. ['.jpg', '.tar.gz'])"""
+
+        self.follow_links = False
+        """Whether symbolic links to folders are entered (links to a parent folder make the walk endless)"""
+
+        self.include_files = True
+        """Whether files are yielded"""
+
+        self.include_folders = False
+        """Whether folders are yielded, except the one that is walked"""
+
+        self.max_size: int | None = None
+        """The maximum size of the files to yield, in bytes"""
+
+        self.min_size: int | None = None
+        """The minimum size of the files to yield, in bytes"""
+
+        self.on_error: Callable[[OSError], None] | None = None
+        """Called with the error when a folder cannot be read. By default, the folder is skipped."""
+
+        self.pattern: str | None = None
+        """A glob pattern that the names of the files and folders to yield must match (e.g. '*.log')"""
+
+        self.recursive = True
+        """Whether the subfolders are walked"""
+
+        self.workers = 0
+        """The number of threads that read folders in parallel, or 0 to walk the tree in the calling thread"""
+
+    def walk(self, path: str) -> Iterator[str]:
+        """
+        Walk a directory tree
+        :param path: The folder to walk
+        :return: A generator of the paths of the matching files and folders
+        """
+        if self.workers > 0 and self.recursive:
+            return self._walk_in_parallel(path)
+        return self._walk_serially(path)
+
+    @staticmethod
+    def _compile_pattern(pattern: str | None) -> Callable[[str], object] | None:
+        if pattern is None:
+            return None
+        match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        return lambda name: match(os.path.normcase(name))
+
+    def _create_filters(self) -> tuple:
+        excluded = [FileWalker._compile_pattern(pattern) for pattern in (self.exclude_folders or [])]
+        extensions = tuple(self.extensions) if self.extensions is not None else None
+        return FileWalker._compile_pattern(self.pattern), extensions, excluded
+
+    def _is_matching_file(self, entry: os.DirEntry, name_matcher, extensions: tuple[str, ...] | None) -> bool:
+        name = entry.name
+        if extensions is not None and not name.endswith(extensions):
+            return False
+        if name_matcher is not None and not name_matcher(name):
+            return False
+        if self.min_size is not None or self.max_size is not None:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                return False
+            if self.min_size is not None and size < self.min_size:
+                return False
+            if self.max_size is not None and size > self.max_size:
+                return False
+        return True
+
+    def _is_matching_folder(self, path: str, name_matcher) -> bool:
+        return self.include_folders and (name_matcher is None or name_matcher(os.path.basename(path)))
+
+    def _scan(self, directory: str, subdirectories: list[str], filters: tuple) -> Iterator[str]:
+        # Yields the matching files of a folder, and collects the subfolders to walk
+        name_matcher, extensions, excluded = filters
+        try:
+            entries = os.scandir(directory)
+        except OSError as error:
+            if self.on_error is not None:
+                self.on_error(error)
+            return
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not self.recursive:
+                        if self._is_matching_folder(entry.path, name_matcher):
+                            yield entry.path
+                    elif (self.follow_links or not entry.is_symlink()) \
+                            and not any(is_excluded(entry.name) for is_excluded in excluded):
+                        subdirectories.append(entry.path)
+                elif self.include_files and entry.is_file() \
+                        and self._is_matching_file(entry, name_matcher, extensions):
+                    yield entry.path
+
+    def _scan_all(self, directory: str, filters: tuple) -> tuple[str, list[str], list[str]]:
+        subdirectories: list[str] = []
+        return directory, list(self._scan(directory, subdirectories, filters)), subdirectories
+
+    def _walk_in_parallel(self, path: str) -> Iterator[str]:
+        # The folders waiting to be read are queued, and only a few of them per worker are submitted at once,
+        # so that the memory used by the walk does not grow with the number of folders of the tree
+        filters = self._create_filters()
+        max_pending = self.workers * _MAX_PENDING_DIRECTORIES_PER_WORKER
+        waiting = deque([path])
+        pending: set[Future] = set()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while len(waiting) > 0 or len(pending) > 0:
+                while len(waiting) > 0 and len(pending) < max_pending:
+                    pending.add(executor.submit(self._scan_all, waiting.popleft(), filters))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory, paths, subdirectories = future.result()
+                    if directory != path and self._is_matching_folder(directory, filters[0]):
+                        yield directory
+                    yield from paths
+                    waiting.extend(subdirectories)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _walk_serially(self, path: str) -> Iterator[str]:
+        filters = self._create_filters()
+        stack = [path]
+        while len(stack) > 0:
+            directory = stack.pop()
+            if directory != path and self._is_matching_folder(directory, filters[0]):
+                yield directory
+            subdirectories: list[str] = []
+            yield from self._scan(directory, subdirectories, filters)
+            stack.extend(reversed(subdirectories))
@@ -1,11 +1,18 @@
 import os
 
+from .file_walker import FileWalker
+
 
 class FileUtils:
     @staticmethod
     def get_files_of_type(path, file_type, recursive=False, fullpath=True):
-        filelist = FileUtils.list_files(path, recursive=recursive, fullpath=fullpath)
-        return [f for f in filelist if f.endswith(file_type)]
+        if recursive:
+            walker = FileWalker()
+            walker.extensions = [file_type]
+            filelist = list(walker.walk(path))
+        else:
+            filelist = [f for f in FileUtils._list_files_non_recursively(path) if f.endswith(file_type)]
+        return filelist if fullpath else FileUtils._get_base_names_only(filelist)
 
     @staticmethod
     def get_readable_file_size(size: int, suffix: str = "B"):
@@ -47,11 +54,12 @@ class FileUtils:
 
     @staticmethod
     def _list_files_recursively(path):
-        return [os.path.join(dp, f) for dp, dn, filenames in os.walk(path) for f in filenames]
+        return list(FileWalker().walk(path))
 
     @staticmethod
     def _list_files_non_recursively(path):
-        return [os.path.join(path, f) for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
+        with os.scandir(path) as entries:
+            return [entry.path for entry in entries if entry.is_file()]
 
     @staticmethod
     def _get_base_names_only(filelist: list):
@@ -59,8 +67,12 @@ class FileUtils:
 
     @staticmethod
     def _list_folders_recursively(path):
-        return [dp for dp, dn, filenames in os.walk(path) if dp != path]
+        walker = FileWalker()
+        walker.include_files = False
+        walker.include_folders = True
+        return list(walker.walk(path))
 
     @staticmethod
     def _list_folders_non_recursively(path):
-        return [os.path.join(path, item) for item in os.listdir(path) if os.path.isdir(os.path.join(path, item))]
+        with os.scandir(path) as entries:
+            return [entry.path for entry in entries if entry.is_dir()]
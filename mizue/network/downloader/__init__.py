@@ -1,14 +1,18 @@
 from .download_event import DownloadEventType, ProgressEventArgs, DownloadStartEvent, DownloadFailureEvent, \
     DownloadCompleteEvent
+from .concurrency_controller import ConcurrencyController
+from .slow_transfer_error import SlowTransferError
 from .downloader import Downloader
 from .downloader_tool import DownloaderTool
 
 __all__ = [
+    'ConcurrencyController',
     'DownloadEventType',
     'ProgressEventArgs',
     'DownloadStartEvent',
     'DownloadFailureEvent',
     'DownloadCompleteEvent',
     'Downloader',
+    'SlowTransferError',
     'DownloaderTool'
 ]
@@ -0,0 +1,110 @@
+import time
+from threading import Lock
+
+
+class ConcurrencyController:
+    """
+    Adjusts the number of parallel downloads at runtime using additive increase / multiplicative decrease.
+
+    Every interval, the aggregate throughput, the error rate and the throttling responses (429/503) of the last
+    interval are evaluated:
+        - If the server throttled any request or the error rate exceeds the threshold, the limit is multiplied
+          by the backoff factor.
+        - If the previous increase did not improve the throughput, the increase is undone and the limit is held
+          for one interval before probing again.
+        - Otherwise, the limit is increased by one.
+
+    The limit always stays within the [min_parallel, max_parallel] bounds.
+    """
+
+    def __init__(self, min_parallel: int = 1, max_parallel: int = 32, initial_parallel: int | None = None,
+                 interval: float = 1.0):
+        if min_parallel <= 0 or max_parallel < min_parallel:
+            raise ValueError("The bounds must satisfy 0 < min_parallel <= max_parallel")
+        self._bytes = 0
+        self._completions = 0
+        self._failures = 0
+        self._last_action = ""
+        self._limit = float(min(max(initial_parallel or min_parallel, min_parallel), max_parallel))
+        self._lock = Lock()
+        self._previous_throughput = 0.0
+        self._throttled = False
+        self._window_start = time.perf_counter()
+
+        self.backoff = 0.5
+        """The factor the limit is multiplied by when the server throttles requests or the error rate is high"""
+
+        self.error_threshold = 0.1
+        """The error rate above which the limit is decreased"""
+
+        self.interval = interval
+        """The time in seconds between adjustments"""
+
+        self.max_parallel = max_parallel
+        """The maximum number of parallel downloads"""
+
+        self.min_parallel = min_parallel
+        """The minimum number of parallel downloads"""
+
+        self.tolerance = 0.05
+        """The relative throughput gain required for an increase to be kept"""
+
+    @property
+    def limit(self) -> int:
+        """The current number of parallel downloads"""
+        return int(self._limit)
+
+    @property
+    def throughput(self) -> float:
+        """The aggregate throughput of the last completed interval in bytes per second"""
+        return self._previous_throughput
+
+    def record_bytes(self, count: int) -> None:
+        """Record downloaded bytes. This method can be called from any thread."""
+        with self._lock:
+            self._bytes += count
+
+    def record_completion(self) -> None:
+        """Record a successful download. This method can be called from any thread."""
+        with self._lock:
+            self._completions += 1
+
+    def record_failure(self, status_code: int | None = None) -> None:
+        """Record a failed download. This method can be called from any thread."""
+        with self._lock:
+            self._failures += 1
+            if status_code in (429, 503):
+                self._throttled = True
+
+    def update(self) -> int:
+        """
+        Adjust the limit if an interval has passed since the last adjustment
+        :return: The current limit
+        """
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed < self.interval:
+            return self.limit
+
+        with self._lock:
+            throughput = self._bytes / elapsed
+            completions, failures, throttled = self._completions, self._failures, self._throttled
+            self._bytes = self._completions = self._failures = 0
+            self._throttled = False
+            self._window_start = now
+
+        finished = completions + failures
+        if throttled or (finished > 0 and failures / finished > self.error_threshold):
+            self._limit = self._limit * self.backoff
+            self._last_action = "decrease"
+        elif self._last_action == "increase" and throughput < self._previous_throughput * (1 + self.tolerance):
+            self._limit -= 1
+            self._last_action = "hold"
+        elif self._last_action == "hold":
+            self._last_action = ""
+        else:
+            self._limit += 1
+            self._last_action = "increase"
+        self._limit = min(max(self._limit, float(self.min_parallel)), float(self.max_parallel))
+        self._previous_throughput = throughput
+        return self.limit
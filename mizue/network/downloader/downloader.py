@@ -1,22 +1,56 @@
 import os
+import queue
+import socket
+import threading
+import time
 import urllib.parse
 import uuid
+from collections import deque
 from typing import Callable
 
 import requests
 from pathvalidate import sanitize_filename
 
-from mizue.util import EventListener
+from mizue.util import CancellationToken, EventListener, OperationCancelledError
 from .download_event import DownloadEventType, DownloadFailureEvent, DownloadCompleteEvent, DownloadStartEvent, \
     ProgressEventArgs
 from .download_metadata import DownloadMetadata
 from .progress_data import ProgressData
+from .slow_transfer_error import SlowTransferError
 
 
 class Downloader(EventListener):
     def __init__(self):
         super().__init__()
-        self._alive = True
+        self._cancellation_token = CancellationToken()
+        self._response_times: deque[float] = deque(maxlen=100)
+
+        self.hedge = False
+        """
+        Whether to send a hedged request to the next mirror if the current one has not responded in time.
+        Only applies when a list of mirror URLs is downloaded.
+        """
+
+        self.hedge_delay = 1.0
+        """
+        The time in seconds to wait before sending a hedged request until a response time is recorded,
+        and the maximum wait until enough response times are recorded to use hedge_percentile
+        """
+
+        self.hedge_percentile = 95
+        """The percentile of the recorded response times to wait before sending a hedged request"""
+
+        self.keep_partial_files = False
+        """Whether to keep partially downloaded files when a download is cancelled or aborted"""
+
+        self.min_speed = 0
+        """
+        The minimum transfer speed in bytes per second, measured over min_speed_window.
+        Slower transfers are aborted with a SlowTransferError. Set to 0 to disable.
+        """
+
+        self.min_speed_window = 10.0
+        """The time window in seconds over which the transfer speed is measured. Must be greater than 0."""
 
         self.output_path = "."
         """The output path for the downloaded files"""
@@ -27,64 +61,114 @@ class Downloader(EventListener):
         self.timeout = 10
         """The timeout in seconds for the connection"""
 
+        self.transfer_deadline = 0
+        """
+        The maximum time in seconds a transfer may take once the response has been received.
+        Longer transfers are aborted with a SlowTransferError. Set to 0 to disable.
+        """
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether the downloader has been closed via the close() method"""
+        return self._cancellation_token.is_cancelled
+
     def close(self):
         """
         Closes the downloader. This will stop any ongoing downloads.
 
+        Ongoing connections and reads are aborted immediately instead of waiting for the timeout.
+        Partially downloaded files are removed unless keep_partial_files is set.
+
         In order to download again, a new instance of the downloader must be created,
         or the open() method must be called.
         """
-        self._alive = False
+        self._cancellation_token.cancel()
 
-    def download(self, url: str, output_path: str = None):
+    def download(self, url: str | list[str], output_path: str = None):
+        """
+        Download a file
+        :param url: The URL to download, or a list of equivalent mirror URLs.
+            Mirrors are tried in order until one of them succeeds.
+            If hedge is enabled, the next mirror is requested in parallel when the current one is slow to respond.
+        :param output_path: The output directory
+        :return: None
+        """
+        if self.min_speed > 0 and self.min_speed_window <= 0:
+            raise ValueError("The speed window must be greater than zero when a minimum speed is set")
         path_to_save = output_path if output_path is not None and len(output_path) > 0 else self.output_path
-
-        response = self._get_response(url)
-        if response and response.status_code == 200:
-            metadata = self._get_download_metadata(response, path_to_save)
-            self._download(response, metadata, path_to_save, lambda init_data: self._progress_init(init_data),
-                           lambda progress_data: self._progress_callback(progress_data))
+        if isinstance(url, str):
+            response = self._get_response(url)
+            if response and response.status_code == 200:
+                metadata = self._get_download_metadata(response, path_to_save)
+                self._download(response, metadata, path_to_save, lambda init_data: self._progress_init(init_data),
+                               lambda progress_data: self._progress_callback(progress_data))
+            else:
+                self._fire_failure_event(url, response, exception=None)
         else:
-            self._fire_failure_event(url, response, exception=None)
+            self._download_from_mirrors(list(url), path_to_save)
 
     def open(self):
         """
         Opens the downloader. This will allow downloads to be performed once again.
         Use this method if the downloader has been closed via the close() method.
         """
-        self._alive = True
+        if self._cancellation_token.is_cancelled:
+            self._cancellation_token = CancellationToken()
 
     def _download(self, response: requests.Response, metadata: DownloadMetadata, output_path: str = None,
                   progress_init: Callable[[DownloadMetadata], None] = None,
-                  progress_callback: Callable[[ProgressData], None] = None):
+                  progress_callback: Callable[[ProgressData], None] = None, report_failure: bool = True):
         if not os.path.exists(output_path):
             os.makedirs(output_path, exist_ok=True)
         if progress_init:
             progress_init(metadata)
+        cancellation_token = self._cancellation_token
+        abort_callback_id = cancellation_token.register(lambda: self._abort_response(response))
+        progress = [0]
+        abort_reasons: list[str] = []
+        finished = threading.Event()
+        watch_lock = threading.Lock()
+        if self.min_speed > 0 or self.transfer_deadline > 0:
+            threading.Thread(target=self._watch_transfer,
+                             args=(response, progress, finished, abort_reasons, watch_lock), daemon=True).start()
         try:
             with open(metadata.filepath, 'wb') as f:
                 downloaded = 0
-                for chunk in response.iter_content(chunk_size=1024):
-                    if not self._alive:
-                        break
-                    response.raw.decode_content = True
-                    chunk_size = len(chunk)
-                    f.write(chunk)
-                    downloaded += chunk_size
-                    percent = int((downloaded / metadata.filesize) * 100)
-                    if progress_callback:
-                        progress_data = ProgressData(
-                            downloaded=downloaded,
-                            filename=metadata.filename,
-                            filepath=metadata.filepath,
-                            filesize=metadata.filesize,
-                            percent=percent,
-                            finished=False,
-                            url=metadata.url,
-                            uuid=metadata.uuid
-                        )
-                        progress_callback(progress_data)
-                if self._alive:
+                try:
+                    for chunk in response.iter_content(chunk_size=1024):
+                        if cancellation_token.is_cancelled or len(abort_reasons) > 0:
+                            break
+                        response.raw.decode_content = True
+                        chunk_size = len(chunk)
+                        f.write(chunk)
+                        downloaded += chunk_size
+                        progress[0] = downloaded
+                        percent = int((downloaded / metadata.filesize) * 100)
+                        if progress_callback:
+                            progress_data = ProgressData(
+                                downloaded=downloaded,
+                                filename=metadata.filename,
+                                filepath=metadata.filepath,
+                                filesize=metadata.filesize,
+                                percent=percent,
+                                finished=False,
+                                url=metadata.url,
+                                uuid=metadata.uuid
+                            )
+                            progress_callback(progress_data)
+                except Exception as e:
+                    # Aborting the response on cancellation makes the pending read fail
+                    if not cancellation_token.is_cancelled and len(abort_reasons) == 0:
+                        raise e
+                with watch_lock:
+                    finished.set()  # The watchdog cannot abort the transfer from now on
+                if len(abort_reasons) > 0 and not cancellation_token.is_cancelled \
+                        and not self._is_transfer_complete(response, downloaded):
+                    f.close()
+                    if not self.keep_partial_files:
+                        os.remove(metadata.filepath)
+                    raise SlowTransferError(abort_reasons[0])
+                if not cancellation_token.is_cancelled:
                     if progress_callback:
                         progress_data = ProgressData(
                             downloaded=downloaded,
@@ -99,19 +183,68 @@ class Downloader(EventListener):
                         progress_callback(progress_data)
                 else:
                     f.close()
-                    os.remove(metadata.filepath)
-                    self._fire_failure_event(metadata.url, response, exception=Exception("Download cancelled"),
+                    if not self.keep_partial_files:
+                        os.remove(metadata.filepath)
+                    self._fire_failure_event(metadata.url, response,
+                                             exception=OperationCancelledError("Download cancelled"),
                                              filepath=metadata.filepath)
         except Exception as e:
-            self._fire_failure_event(metadata.url, response, exception=e, filepath=metadata.filepath)
+            if report_failure:
+                self._fire_failure_event(metadata.url, response, exception=e, filepath=metadata.filepath)
             raise e
+        finally:
+            finished.set()
+            cancellation_token.unregister(abort_callback_id)
+
+    def _download_from_mirrors(self, urls: list[str], output_path: str):
+        pending = deque(urls)
+        response: requests.Response | None = None
+        exception: BaseException | None = None
+        while len(pending) > 0 and not self._cancellation_token.is_cancelled:
+            response, exception = self._get_first_response(pending)
+            if response is None or response.status_code != 200:
+                if response is not None:
+                    response.close()
+                continue
+            metadata = self._get_download_metadata(response, output_path)
+            try:
+                self._download(response, metadata, output_path, lambda init_data: self._progress_init(init_data),
+                               lambda progress_data: self._progress_callback(progress_data),
+                               report_failure=len(pending) == 0)
+                return
+            except Exception as e:
+                if len(pending) == 0:
+                    raise e
+                exception = e
+                if not self.keep_partial_files and os.path.exists(metadata.filepath):
+                    os.remove(metadata.filepath)
+        self._fire_failure_event(urls[-1], response, exception=exception)
+
+    @staticmethod
+    def _abort_response(response: requests.Response):
+        """Abort a response that may be blocked in a read on another thread"""
+        fp = getattr(getattr(response.raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        response.close()
+
+    @staticmethod
+    def _close_responses(results: queue.Queue, count: int):
+        for _ in range(count):
+            response, _ = results.get()
+            if response is not None:
+                response.close()
 
     def _fire_failure_event(self, url: str, response: requests.Response, exception: BaseException | None,
                             filepath: str = None):
         self._fire_event(DownloadEventType.FAILED, DownloadFailureEvent(
             url=url,
-            status_code=response.status_code if response else -1,
-            reason=response.reason if response else "Unknown",
+            status_code=response.status_code if response is not None else -1,
+            reason=response.reason if response is not None else "Unknown",
             exception=exception,
             filepath=filepath,
         ))
@@ -144,29 +277,163 @@ class Downloader(EventListener):
                 return sanitize_filename(filename)
         return None
 
+    def _get_first_response(self, pending: deque[str]) -> tuple[requests.Response | None, BaseException | None]:
+        """
+        Request the mirrors in the pending queue until one of them responds with 200.
+        If hedging is enabled, the next mirror is requested in parallel when the current one is slow to respond.
+        The mirrors that have been requested are removed from the queue.
+        Responses of the requests that lose the race are closed as soon as they arrive.
+        :return: The first successful response (or the last failed one) and the last exception raised, if any
+        """
+        if not self.hedge or len(pending) == 1:
+            url = pending.popleft()
+            try:
+                return self._request(url), None
+            except (requests.exceptions.RequestException, OperationCancelledError) as e:
+                return None, e
+
+        results: queue.Queue[tuple[requests.Response | None, BaseException | None]] = queue.Queue()
+
+        def fetch(mirror_url: str):
+            try:
+                results.put((self._request(mirror_url), None))
+            except (requests.exceptions.RequestException, OperationCancelledError) as fetch_exception:
+                results.put((None, fetch_exception))
+
+        def launch_next():
+            threading.Thread(target=fetch, args=(pending.popleft(),), daemon=True).start()
+
+        launch_next()
+        in_flight = 1
+        response: requests.Response | None = None
+        exception: BaseException | None = None
+        while in_flight > 0:
+            try:
+                timeout = self._get_hedge_delay() if len(pending) > 0 and in_flight == 1 else None
+                response, exception = results.get(timeout=timeout)
+            except queue.Empty:
+                launch_next()
+                in_flight += 1
+                continue
+            in_flight -= 1
+            if response is not None and response.status_code == 200:
+                if in_flight > 0:
+                    threading.Thread(target=self._close_responses, args=(results, in_flight), daemon=True).start()
+                return response, None
+            if response is not None:
+                response.close()
+            if len(pending) > 0 and in_flight == 0:
+                launch_next()
+                in_flight += 1
+        return response, exception
+
+    def _get_hedge_delay(self) -> float:
+        response_times = sorted(self._response_times)
+        if len(response_times) == 0:
+            return self.hedge_delay
+        if len(response_times) < 20:
+            # Too few samples for the percentile: a few times the typical response time seen so far is used,
+            # so that hedging already helps at the start of a bulk download
+            return min(self.hedge_delay, 3 * response_times[len(response_times) // 2])
+        index = min(len(response_times) - 1, int(len(response_times) * self.hedge_percentile / 100))
+        return response_times[index]
+
     def _get_response(self, url: str) -> requests.Response | None:
-        fetching = True
+        try:
+            return self._request(url)
+        except (requests.exceptions.RequestException, OperationCancelledError) as e:
+            self._fire_failure_event(url, None, e)
+            return None
+
+    @staticmethod
+    def _is_transfer_complete(response: requests.Response, downloaded: int) -> bool:
+        """Whether the whole body has been received, which is only known when the Content-Length is sent"""
+        content_length = response.headers.get("Content-Length")
+        return content_length is not None and downloaded >= int(content_length)
+
+    def _request(self, url: str) -> requests.Response:
         fetch_try_count = 0
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
         }
 
-        response: requests.Response | None = None
-        while fetching:
+        while True:
             try:
-                response = requests.get(url, stream=True, timeout=self.timeout, headers=headers)
-                fetching = False
+                started = time.perf_counter()
+                response = self._request_cancellable(url, headers)
+                if response.status_code == 200:
+                    self._response_times.append(time.perf_counter() - started)
+                return response
             except requests.exceptions.Timeout as e:
                 fetch_try_count += 1
                 if fetch_try_count > self.retry_count:
-                    fetching = False
-                    self._fire_failure_event(url, response, e)
-                continue
-            except requests.exceptions.RequestException as e:
-                fetching = False
-                self._fire_failure_event(url, response, e)
-                continue
-        return response
+                    raise e
+
+    def _request_cancellable(self, url: str, headers: dict[str, str]) -> requests.Response:
+        """
+        Send the request on a helper thread, so that the caller can return as soon as the downloader is closed,
+        even if the connection is stuck. A response that arrives after cancellation is closed.
+        """
+        cancellation_token = self._cancellation_token
+        cancellation_token.raise_if_cancelled()
+        result: dict[str, requests.Response | BaseException] = {}
+        finished = threading.Event()
+
+        def send():
+            try:
+                result["response"] = requests.get(url, stream=True, timeout=self.timeout, headers=headers)
+            except BaseException as e:
+                result["exception"] = e
+            finished.set()
+            if cancellation_token.is_cancelled and "response" in result:
+                result["response"].close()
+
+        wake_callback_id = cancellation_token.register(finished.set)
+        try:
+            threading.Thread(target=send, daemon=True).start()
+            finished.wait()
+        finally:
+            cancellation_token.unregister(wake_callback_id)
+        if cancellation_token.is_cancelled:
+            if "response" in result:
+                result["response"].close()
+            raise OperationCancelledError("Operation cancelled")
+        if "exception" in result:
+            raise result["exception"]
+        return result["response"]
+
+    def _watch_transfer(self, response: requests.Response, progress: list[int], finished: threading.Event,
+                        abort_reasons: list[str], lock: threading.Lock):
+        """
+        Abort the response if the transfer is slower than min_speed over min_speed_window,
+        or if it takes longer than transfer_deadline. The response is aborted even if a read is stalled.
+        No reason is added once the transfer is finished, which is set while holding the lock.
+        """
+        started = time.perf_counter()
+        samples: deque[tuple[float, int]] = deque([(started, 0)])
+        window = self.min_speed_window if self.min_speed > 0 else self.transfer_deadline
+        check_interval = max(0.05, min(1.0, window / 4))  # The floor keeps very short windows from busy-waiting
+        while not finished.wait(check_interval):
+            now = time.perf_counter()
+            reason = None
+            if 0 < self.transfer_deadline < now - started:
+                reason = f"The transfer exceeded the deadline of {self.transfer_deadline} seconds"
+            elif self.min_speed > 0:
+                samples.append((now, progress[0]))
+                while len(samples) > 1 and now - samples[1][0] >= self.min_speed_window:
+                    samples.popleft()
+                window_start, window_downloaded = samples[0]
+                if now - window_start >= self.min_speed_window:
+                    speed = (progress[0] - window_downloaded) / (now - window_start)
+                    if speed < self.min_speed:
+                        reason = f"The transfer speed dropped below {self.min_speed} B/s ({speed:.0f} B/s)"
+            if reason is not None:
+                with lock:
+                    if finished.is_set():
+                        return
+                    abort_reasons.append(reason)
+                self._abort_response(response)
+                return
 
     def _progress_callback(self, data: ProgressData):
         self._fire_event(DownloadEventType.PROGRESS, ProgressEventArgs(
@@ -1,16 +1,16 @@
 import concurrent.futures
 import json
 import os
-import time
+import threading
 from dataclasses import dataclass
 
 from mizue.file import FileUtils
 from mizue.network.downloader import DownloadStartEvent, ProgressEventArgs, DownloadCompleteEvent, Downloader, \
-    DownloadEventType, DownloadFailureEvent
+    DownloadEventType, DownloadFailureEvent, ConcurrencyController, SlowTransferError
 from mizue.printer import Printer
 from mizue.printer.grid import ColumnSettings, Alignment, Grid, BorderStyle, CellRendererArgs
 from mizue.progress import LabelRendererArgs, \
-    InfoSeparatorRendererArgs, InfoTextRendererArgs, ColorfulProgress
+    InfoSeparatorRendererArgs, InfoTextRendererArgs, ColorfulProgress, Progress, RateRendererArgs
 from mizue.util import EventListener
 
 
@@ -19,6 +19,7 @@ class _DownloadReport:
     filename: str
     filesize: int
     url: str
+    cancelled: bool = False
 
 
 class DownloaderTool(EventListener):
@@ -27,7 +28,10 @@ class DownloaderTool(EventListener):
         self._file_color_scheme = {}
         self._report_data: list[_DownloadReport] = []
         self._bulk_download_size = 0
+        self._concurrency_controller: ConcurrencyController | None = None
+        self._downloader: Downloader | None = None
         self._downloaded_count = 0
+        self._entry_failure = threading.local()  # The failure event of the entry downloaded by a worker thread
         self._total_download_count = 0
         self._success_count = 0  # For bulk downloads
         self._failure_count = 0  # For bulk downloads
@@ -35,18 +39,48 @@ class DownloaderTool(EventListener):
         self.display_report = True
         """Whether to display the download report after the download is complete"""
 
+        self.hedge = False
+        """Whether to send hedged requests to the next mirror when a mirror is slow to respond"""
+
+        self.keep_partial_files = False
+        """Whether to keep partially downloaded files when the downloads are cancelled"""
+
+        self.max_requeues = 2
+        """
+        The number of times a bulk download aborted for being too slow is requeued.
+        With a ConcurrencyController, downloads rejected with 429 or 503 while it probes the limit are requeued too.
+        Requeued downloads are retried after the other pending downloads, starting with the next mirror.
+        """
+
+        self.min_speed = 0
+        """The minimum transfer speed in bytes per second below which a download is aborted. Set to 0 to disable."""
+
+        self.min_speed_window = 10.0
+        """The time window in seconds over which the transfer speed is measured"""
+
+        self.transfer_deadline = 0
+        """The maximum time in seconds a transfer may take before it is aborted. Set to 0 to disable."""
+
         self.progress: ColorfulProgress | None = None
         self._load_color_scheme()
 
-    def download(self, url: str, output_path: str):
+    def cancel(self) -> None:
+        """
+        Cancel the ongoing downloads. This method can be called from any thread.
+        Ongoing connections and reads are aborted immediately.
+        """
+        if self._downloader is not None:
+            self._downloader.close()
+
+    def download(self, url: str | list[str], output_path: str):
         """
         Download a file to a specified directory
-        :param url: The URL to download
+        :param url: The URL to download, or a list of equivalent mirror URLs
         :param output_path: The output directory
         :return: None
         """
         filepath = []
-        downloader = Downloader()
+        downloader = self._create_downloader()
         downloader.add_event(DownloadEventType.STARTED, lambda event: self._on_download_start(event, filepath))
         downloader.add_event(DownloadEventType.PROGRESS, lambda event: self._on_download_progress(event))
         downloader.add_event(DownloadEventType.COMPLETED, lambda event: self._on_download_complete(event))
@@ -57,14 +91,18 @@ class DownloaderTool(EventListener):
             downloader.close()
             self.progress.stop()
             Printer.warning(f"{os.linesep}Keyboard interrupt detected. Cleaning up...")
-            if len(filepath) > 0:
+            if len(filepath) > 0 and os.path.exists(filepath[0]) and not self.keep_partial_files:
                 os.remove(filepath[0])
+            url = url if isinstance(url, str) else url[0]
             self._report_data.append(_DownloadReport(url, 0, url))
+        except SlowTransferError:
+            pass  # The failure has been reported by the failure event, like other failures
 
         if self.display_report:
             self._print_report()
 
-    def download_bulk(self, urls: list[str] | list[tuple[str, str]], output_path: str | None = None, parallel: int = 4):
+    def download_bulk(self, urls: list[str | list[str]] | list[tuple[str | list[str], str]],
+                      output_path: str | None = None, parallel: int | ConcurrencyController = 4):
         """
         Download a list of files to a specified directory or a list of [url, output_path] tuples.
 
@@ -73,9 +111,11 @@ class DownloaderTool(EventListener):
 
         If the urls parameter is a list of urls, every url will be downloaded to the output_path parameter.
         In this case, the output_path parameter must be specified.
+
+        In both cases, a url can also be a list of equivalent mirror URLs.
         :param urls: A list of urls or a list of [url, output_path] tuples
         :param output_path: The output directory if the urls parameter is a list of urls
-        :param parallel: Number of parallel downloads
+        :param parallel: Number of parallel downloads, or a ConcurrencyController to adjust it at runtime
         :return: None
         """
         if isinstance(urls[0], tuple):
@@ -83,21 +123,25 @@ class DownloaderTool(EventListener):
         else:
             self.download_list(urls, output_path, parallel)
 
-    def download_list(self, urls: list[str], output_path: str, parallel: int = 4):
+    def download_list(self, urls: list[str | list[str]], output_path: str,
+                      parallel: int | ConcurrencyController = 4):
         """
         Download a list of files to a specified directory
-        :param urls: The list of URLs to download
+        :param urls: The list of URLs to download. Every item can also be a list of equivalent mirror URLs
         :param output_path: The output directory
-        :param parallel: Number of parallel downloads
+        :param parallel: Number of parallel downloads, or a ConcurrencyController to adjust it at runtime
         :return: None
         """
         self.download_tuple([(url, output_path) for url in urls], parallel)
 
-    def download_tuple(self, urls: list[tuple[str, str]], parallel: int = 4):
+    def download_tuple(self, urls: list[tuple[str | list[str], str]], parallel: int | ConcurrencyController = 4):
         """
         Download a list of [url, output_path] tuples. Every url will be downloaded to its corresponding output_path.
+        A url can also be a list of equivalent mirror URLs, which are tried in order until one of them succeeds.
+        The COMPLETED and FAILED events are fired once for every entry, when it has been downloaded or has finally
+        failed (requeued attempts are not reported).
         :param urls: A list of [url, output_path] tuples
-        :param parallel: Number of parallel downloads
+        :param parallel: Number of parallel downloads, or a ConcurrencyController to adjust it at runtime
         :return: None
         """
 
@@ -110,29 +154,59 @@ class DownloaderTool(EventListener):
         self._success_count = 0
         self._failure_count = 0
         download_dict = {}
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+        controller = parallel if isinstance(parallel, ConcurrencyController) else None
+        self._concurrency_controller = controller
+        max_workers = controller.max_parallel if controller else parallel
+
+        pending = self._get_unique_entries(urls)
+        pending.reverse()
+        # The entries carry the key of their first attempt, as the mirrors of requeued entries are rotated
+        in_flight: dict[concurrent.futures.Future, tuple[str | list[str], str, tuple]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             try:
-                responses: list[concurrent.futures.Future] = []
-                downloader = Downloader()
+                requeue_counts: dict[tuple, int] = {}
+                downloader = self._create_downloader()
                 downloader.add_event(DownloadEventType.PROGRESS,
                                      lambda event: self._on_bulk_download_progress(event, download_dict))
                 downloader.add_event(DownloadEventType.COMPLETED,
                                      lambda event: self._on_bulk_download_complete(event))
                 downloader.add_event(DownloadEventType.FAILED, lambda event: self._on_bulk_download_failed(event))
-                for url, output_path in list(set(urls)):
-                    responses.append(executor.submit(downloader.download, url, output_path))
-                for response in concurrent.futures.as_completed(responses):
-                    self._downloaded_count += 1
-                    self.progress.update_value(self._downloaded_count)
-                    self.progress.info_text = self._get_bulk_progress_info(download_dict)
+                # Once the downloads are cancelled, the pending entries are not started, and are reported as cancelled
+                while (len(pending) > 0 and not downloader.is_closed) or len(in_flight) > 0:
+                    limit = controller.update() if controller else parallel
+                    while len(pending) > 0 and len(in_flight) < limit and not downloader.is_closed:
+                        url, output_path, key = pending.pop()
+                        in_flight[executor.submit(self._download_entry, downloader, url, output_path)] = \
+                            (url, output_path, key)
+                    done, _ = concurrent.futures.wait(
+                        in_flight.keys(), timeout=controller.interval if controller else None,
+                        return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        url, output_path, key = in_flight.pop(future)
+                        failure = future.result()
+                        if failure is not None and self._is_requeueable(failure):
+                            # The bytes of the aborted attempt are forgotten, so that the next one starts from zero
+                            for mirror_url in [url] if isinstance(url, str) else url:
+                                download_dict.pop(mirror_url, None)
+                            requeue_counts[key] = requeue_counts.get(key, 0) + 1
+                            if requeue_counts[key] <= self.max_requeues and not downloader.is_closed:
+                                rotated_url = url if isinstance(url, str) else url[1:] + url[:1]
+                                pending.insert(0, (rotated_url, output_path, key))
+                                continue
+                        self._downloaded_count += 1
+                        if failure is not None:
+                            self._record_bulk_download_failure(failure)
+                    self.progress.update(self._downloaded_count, self._get_bulk_progress_info(download_dict))
                 executor.shutdown(wait=True)
             except KeyboardInterrupt:
                 downloader.close()
                 self.progress.stop()
                 Printer.warning(f"{os.linesep}Keyboard interrupt detected. Cleaning up...")
                 executor.shutdown(wait=False, cancel_futures=True)
+                pending.extend(entry for future, entry in in_flight.items() if future.cancelled())
         self.progress.stop()
+        for url, _, _ in reversed(pending):
+            self._report_data.append(_DownloadReport("", 0, url if isinstance(url, str) else url[0], cancelled=True))
         if self.display_report:
             self._print_report()
 
@@ -142,6 +216,30 @@ class DownloaderTool(EventListener):
         self.progress.label_renderer = self._label_renderer
         self.progress.label = "Downloading: "
 
+    def _create_downloader(self) -> Downloader:
+        downloader = Downloader()
+        downloader.hedge = self.hedge
+        downloader.keep_partial_files = self.keep_partial_files
+        downloader.min_speed = self.min_speed
+        downloader.min_speed_window = self.min_speed_window
+        downloader.transfer_deadline = self.transfer_deadline
+        self._downloader = downloader
+        return downloader
+
+    def _download_entry(self, downloader: Downloader, url: str | list[str],
+                        output_path: str) -> DownloadFailureEvent | None:
+        # Runs on a worker thread, and returns the failure of the entry to the dispatcher of download_tuple,
+        # which requeues the entry or records the failure
+        self._entry_failure.event = None
+        try:
+            downloader.download(url, output_path)
+        except Exception as e:
+            if self._entry_failure.event is None:
+                self._entry_failure.event = DownloadFailureEvent(
+                    exception=e, filepath=None, reason=str(e), status_code=-1,
+                    url=url if isinstance(url, str) else url[0])
+        return self._entry_failure.event
+
     @staticmethod
     def _get_basic_colored_text(text: str, percentage: float):
         return ColorfulProgress.get_basic_colored_text(text, percentage)
@@ -151,6 +249,24 @@ class DownloaderTool(EventListener):
         size_text = FileUtils.get_readable_file_size(sum(download_dict.values()))
         return f'{file_progress_text} ⟪{size_text}⟫'
 
+    @staticmethod
+    def _get_entry_key(url: str | list[str], output_path: str) -> tuple:
+        return url if isinstance(url, str) else tuple(url), output_path
+
+    @staticmethod
+    def _get_unique_entries(urls: list[tuple[str | list[str], str]]) -> list[tuple[str | list[str], str, tuple]]:
+        unique_entries = {}
+        for url, output_path in urls:
+            key = DownloaderTool._get_entry_key(url, output_path)
+            unique_entries.setdefault(key, (url, output_path, key))
+        return list(unique_entries.values())
+
+    def _is_requeueable(self, failure: DownloadFailureEvent) -> bool:
+        if isinstance(failure.exception, SlowTransferError):
+            return True
+        # Throttling responses are expected while the controller probes for a higher limit
+        return self._concurrency_controller is not None and failure.status_code in (429, 503)
+
     @staticmethod
     def _info_separator_renderer(args: InfoSeparatorRendererArgs):
         return ColorfulProgress.get_basic_colored_text(" | ", args.percentage)
@@ -183,22 +299,29 @@ class DownloaderTool(EventListener):
     def _on_bulk_download_complete(self, event: DownloadCompleteEvent):
         self._report_data.append(_DownloadReport(event.filename, event.filesize, event.url))
         self._success_count += 1
+        if self._concurrency_controller:
+            self._concurrency_controller.record_completion()
+        self._fire_event(DownloadEventType.COMPLETED, event)
 
     def _on_bulk_download_failed(self, event: DownloadFailureEvent):
-        self._report_data.append(_DownloadReport("", 0, event.url))
-        self._failure_count += 1
+        # The failure is requeued or recorded by the dispatcher in download_tuple
+        self._entry_failure.event = event
+        if isinstance(event.exception, SlowTransferError):
+            return
+        if self._concurrency_controller:
+            self._concurrency_controller.record_failure(event.status_code)
 
     def _on_bulk_download_progress(self, event: ProgressEventArgs, download_dict: dict):
+        if self._concurrency_controller:
+            self._concurrency_controller.record_bytes(event.downloaded - download_dict.get(event.url, 0))
         download_dict[event.url] = event.downloaded
         self.progress.info_text = self._get_bulk_progress_info(download_dict)
 
     def _on_download_complete(self, event: DownloadCompleteEvent):
-        self.progress.update_value(event.filesize)
         downloaded_info = FileUtils.get_readable_file_size(event.filesize)
         filesize_info = FileUtils.get_readable_file_size(event.filesize)
         info = f'[{downloaded_info}/{filesize_info}]'
-        self.progress.info_text = info
-        time.sleep(0.5)
+        self.progress.update(event.filesize, info)
         self.progress.stop()
         self._report_data.append(_DownloadReport(event.filename, event.filesize, event.url))
         self._fire_event(DownloadEventType.COMPLETED, event)
@@ -206,30 +329,34 @@ class DownloaderTool(EventListener):
     def _on_download_failure(self, event: DownloadFailureEvent):
         if isinstance(event.exception, KeyboardInterrupt):
             Printer.warning("Download has been cancelled by user.")
-            print(os.linesep)
+            Printer.write(os.linesep + "\n")
         if self.progress:
             self.progress.terminate()
         self._report_data.append(_DownloadReport("", 0, event.url))
         self._fire_event(DownloadEventType.FAILED, event)
 
     def _on_download_progress(self, event: ProgressEventArgs):
-        self.progress.update_value(event.downloaded)
         downloaded_info = FileUtils.get_readable_file_size(event.downloaded)
         filesize_info = FileUtils.get_readable_file_size(event.filesize)
         info = f'[{downloaded_info}/{filesize_info}]'
-        self.progress.info_text = info
+        self.progress.update(event.downloaded, info)
         self._fire_event(DownloadEventType.PROGRESS, event)
 
     def _on_download_start(self, event: DownloadStartEvent, filepath: list[str]):
+        if self.progress is not None:
+            # A download that failed on a mirror restarts on the next one, and its progress bar is replaced
+            self.progress.terminate()
         self.progress = ColorfulProgress(start=0, end=event.filesize, value=0)
         self._configure_progress()
+        self.progress.rate_renderer = self._rate_renderer
         self.progress.start()
         filepath.append(event.filepath)
         self._fire_event(DownloadEventType.STARTED, event)
 
     def _print_report(self):
         success_data = [report for report in self._report_data if report.filesize > 0]
-        failed_data = [report for report in self._report_data if report.filesize == 0]
+        failed_data = [report for report in self._report_data if report.filesize == 0 and not report.cancelled]
+        cancelled_data = [report for report in self._report_data if report.cancelled]
         row_index = 1
         success_grid_data = []
         for report in success_data:
@@ -243,6 +370,11 @@ class DownloaderTool(EventListener):
             failed_grid_data.append([row_index, report.url, "", 'Failed'])
             row_index += 1
 
+        cancelled_grid_data = []
+        for report in cancelled_data:
+            cancelled_grid_data.append([row_index, report.url, "", 'Cancelled'])
+            row_index += 1
+
         grid_columns: list[ColumnSettings] = [
             ColumnSettings(title='#', alignment=Alignment.RIGHT,
                            renderer=lambda x: Printer.format_hex(x.cell, '#FFCC75')),
@@ -250,16 +382,28 @@ class DownloaderTool(EventListener):
             ColumnSettings(title='Type', alignment=Alignment.RIGHT,
                            renderer=self._report_grid_file_type_column_cell_renderer),
             ColumnSettings(title='Filesize/Status', alignment=Alignment.RIGHT,
-                           renderer=lambda x: Printer.format_hex(x.cell, '#FF0000')
-                           if x.cell == 'Failed' else self._report_grid_cell_renderer(x))
+                           renderer=self._report_grid_status_column_cell_renderer)
         ]
-        grid = Grid(grid_columns, success_grid_data + failed_grid_data)
+        grid = Grid(grid_columns, success_grid_data + failed_grid_data + cancelled_grid_data)
         grid.border_style = BorderStyle.SINGLE
         grid.border_color = '#FFCC75'
         grid.cell_renderer = self._report_grid_cell_renderer
-        print(os.linesep)
+        Printer.write(os.linesep + "\n")
         grid.print()
 
+    @staticmethod
+    def _rate_renderer(args: RateRendererArgs):
+        if args.percentage < 100:
+            text = f" {FileUtils.get_readable_file_size(int(args.rate))}/s ETA {Progress.format_duration(args.eta)}"
+        else:
+            text = f" in {Progress.format_duration(args.elapsed)}"
+        return ColorfulProgress.get_basic_colored_text(text, args.percentage)
+
+    def _record_bulk_download_failure(self, event: DownloadFailureEvent):
+        self._report_data.append(_DownloadReport("", 0, event.url))
+        self._failure_count += 1
+        self._fire_event(DownloadEventType.FAILED, event)
+
     @staticmethod
     def _report_grid_cell_renderer(args: CellRendererArgs):
         if args.cell.endswith("KB"):
@@ -282,3 +426,11 @@ class DownloaderTool(EventListener):
             return Printer.format_hex(args.cell, '#FFCC75')
         color = self._file_color_scheme.get(args.cell, '#FFFFFF')
         return Printer.format_hex(args.cell, color)
+
+    @staticmethod
+    def _report_grid_status_column_cell_renderer(args: CellRendererArgs):
+        if args.cell == 'Failed':
+            return Printer.format_hex(args.cell, '#FF0000')
+        if args.cell == 'Cancelled':
+            return Printer.format_hex(args.cell, '#FFCC75')
+        return DownloaderTool._report_grid_cell_renderer(args)
@@ -0,0 +1,3 @@
+class SlowTransferError(Exception):
+    """Raised when a transfer is aborted because it is slower than the minimum speed or exceeds its deadline"""
+    pass
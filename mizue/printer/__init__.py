@@ -1,4 +1,14 @@
 from .terminal_colors import TerminalColors
+from .color_mode import ColorMode
+from .terminal import Terminal
+from .display_width import DisplayWidth
+from .styled_span import StyledSpan
+from .ansi_text import AnsiText
+from .style import Style
+from .output_sink import OutputSink
+from .buffered_sink import BufferedSink
+from .stream_sink import StreamSink
 from .printer import Printer
 
-__all__ = ['Printer', 'TerminalColors', 'grid']
+__all__ = ['AnsiText', 'BufferedSink', 'ColorMode', 'DisplayWidth', 'OutputSink', 'Printer', 'StreamSink', 'Style',
+           'StyledSpan', 'Terminal', 'TerminalColors', 'grid']
@@ -0,0 +1,117 @@
+import re
+from functools import lru_cache
+
+from .display_width import DisplayWidth
+from .styled_span import StyledSpan
+from .terminal_colors import TerminalColors
+
+_ESCAPE_SEQUENCE_PATTERN = re.compile(r"(\x1b(?:\[[0-?]*[ -/]*[@-~]|[@-Z\\-_]))")
+_MAX_CACHED_LENGTH = 1024
+_RESET_CODES = frozenset(["\x1b[m", "\x1b[0m", "\x1b[00m"])
+
+
+class AnsiText:
+    """
+    Measures and cuts text that contains escape codes.
+
+    A text is scanned once into styled spans, the runs of text that share the same color codes, together with
+    their display widths. Stripping, measuring and truncating all work on those spans, and the spans of short texts,
+    which are the ones seen repeatedly (e.g. the cells of a table), are cached. Escape sequences other than colors
+    (e.g. cursor movements) are dropped from the spans. Texts without escape codes are never parsed.
+    """
+
+    @staticmethod
+    def fit(text: str, max_width: int) -> tuple[str, int]:
+        """
+        Truncates a text to fit in the given width, and measures the result
+        :param text: The text, optionally with color codes
+        :param max_width: The maximum display width
+        :return: The text truncated as by truncate, and its display width
+        """
+        if "\x1b" not in text:
+            width = DisplayWidth.of(text)
+            if width <= max_width:
+                return text, width
+            truncated = DisplayWidth.truncate(text, max_width, width)
+            return truncated, DisplayWidth.of(truncated)
+        spans = AnsiText.parse(text)
+        width = sum(span.width for span in spans)
+        if width <= max_width:
+            return text, width
+        return AnsiText._truncate_spans(spans, max_width)
+
+    @staticmethod
+    def parse(text: str) -> tuple[StyledSpan, ...]:
+        """
+        Splits a text into styled spans
+        :param text: The text, optionally with escape codes
+        :return: The spans of the text in order, without the empty ones
+        """
+        if len(text) <= _MAX_CACHED_LENGTH:
+            return AnsiText._parse_cached(text)
+        return AnsiText._parse(text)  # Long texts are rarely seen twice, and would keep a lot of memory in the cache
+
+    @staticmethod
+    def strip(text: str) -> str:
+        """Returns a text without its escape codes"""
+        if "\x1b" not in text:
+            return text
+        return "".join(span.text for span in AnsiText.parse(text))
+
+    @staticmethod
+    def truncate(text: str, max_width: int) -> str:
+        """
+        Truncates a text to fit in the given width, keeping its colors
+        :param text: The text, optionally with color codes
+        :param max_width: The maximum display width
+        :return: The text itself if it fits, otherwise its longest prefix that fits together with an ellipsis.
+        Every color span of a truncated text is closed, so the text can be printed next to another one.
+        """
+        return AnsiText.fit(text, max_width)[0]
+
+    @staticmethod
+    def width(text: str) -> int:
+        """Returns the display width of a text, ignoring its escape codes"""
+        if "\x1b" not in text:
+            return DisplayWidth.of(text)
+        return sum(span.width for span in AnsiText.parse(text))
+
+    @staticmethod
+    def _parse(text: str) -> tuple[StyledSpan, ...]:
+        spans: list[StyledSpan] = []
+        style = ""
+        for index, part in enumerate(_ESCAPE_SEQUENCE_PATTERN.split(text)):
+            if index & 1:  # The odd parts are the escape sequences
+                if part[-1] == "m" and part[1] == "[":
+                    style = "" if part in _RESET_CODES else style + part
+            elif len(part) > 0:
+                if len(spans) > 0 and spans[-1].style == style:  # Only other escape sequences were in between
+                    part = spans.pop().text + part
+                spans.append(StyledSpan(style, part, DisplayWidth.of(part)))
+        return tuple(spans)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_cached(text: str) -> tuple[StyledSpan, ...]:
+        return AnsiText._parse(text)
+
+    @staticmethod
+    def _truncate_spans(spans: tuple[StyledSpan, ...], max_width: int) -> tuple[str, int]:
+        if max_width <= 0:
+            return "", 0
+        available_width = max_width - 1  # Keep room for the ellipsis
+        parts = []
+        width = 0
+        for style, text, text_width in spans:
+            if width + text_width > available_width:
+                end = 0
+                while width + DisplayWidth.of_char(text[end]) <= available_width:
+                    width += DisplayWidth.of_char(text[end])
+                    end += 1
+                text = text[:end] + DisplayWidth.ELLIPSIS
+                width += 1
+                parts.append(f"{style}{text}{TerminalColors.END_CHAR}" if style else text)
+                break
+            parts.append(f"{style}{text}{TerminalColors.END_CHAR}" if style else text)
+            width += text_width
+        return "".join(parts), width
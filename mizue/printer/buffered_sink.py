@@ -0,0 +1,110 @@
+import atexit
+import sys
+from queue import Empty, SimpleQueue
+from threading import Event, RLock, Thread
+from time import monotonic
+from typing import TextIO
+
+from .output_sink import OutputSink
+
+_STOP = object()
+
+
+class BufferedSink(OutputSink):
+    """
+    Collects the written text and writes it to a stream in batches.
+
+    Any number of threads can write to the sink: their texts are queued, and a single writer thread joins them
+    and writes them at once when max_size characters have been collected or when the oldest pending text
+    has waited for flush_interval seconds, whichever comes first. The order of the texts is preserved.
+    An error raised while writing to the stream does not stop the writer thread, and is raised by the next
+    flush or close.
+    """
+
+    def __init__(self, stream: TextIO | None = None, max_size: int = 65536, flush_interval: float = 0.05):
+        """
+        :param stream: The stream to write to. Defaults to the standard output at the time of each batch.
+        :param max_size: The number of pending characters that triggers a write
+        :param flush_interval: The maximum time, in seconds, that a text waits before it is written
+        """
+        self._error: Exception | None = None
+        self._lock = RLock()  # Reentrant, for the signal handlers that write (e.g. to restore the cursor)
+        self._queue: SimpleQueue = SimpleQueue()
+        self._stream = stream
+        self._thread: Thread | None = None
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+
+    def close(self) -> None:
+        # The texts are queued while holding the lock, so none of them can be queued after the stop
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            atexit.unregister(self.close)
+            thread.join()
+        self._raise_error()
+
+    def flush(self) -> None:
+        written = Event()
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(written)
+        written.wait()
+        self._raise_error()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._start()
+            self._queue.put(text)
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            item = self._queue.get()
+            batch: list[str] = []
+            size = 0
+            deadline = monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+                if isinstance(item, Event):
+                    self._write(batch)
+                    batch, size = [], 0
+                    item.set()
+                    break
+                batch.append(item)
+                size += len(item)
+                timeout = deadline - monotonic()
+                if size >= self.max_size or timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except Empty:
+                    break
+            self._write(batch)
+
+    def _start(self) -> None:
+        # Called while holding the lock
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # Do not lose the pending text if the sink is never closed
+
+    def _write(self, batch: list[str]) -> None:
+        if len(batch) > 0:
+            try:
+                stream = self._stream or sys.stdout
+                stream.write("".join(batch))
+                stream.flush()
+            except Exception as e:  # The batch is lost, but the thread keeps answering the flushes
+                if self._error is None:
+                    self._error = e
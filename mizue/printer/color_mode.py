@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ColorMode(Enum):
+    TRUECOLOR = 1,
+    COLORS_256 = 2,
+    COLORS_16 = 3,
+    NONE = 4
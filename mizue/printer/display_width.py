@@ -0,0 +1,88 @@
+from wcwidth import wcwidth
+
+
+class _WidthTable(dict):
+    """A lookup table of character widths that computes and caches the width of unseen characters"""
+
+    def __missing__(self, char: str) -> int:
+        width = 2 if wcwidth(char) == 2 else 1
+        self[char] = width
+        return width
+
+
+class _DoublingTable(dict):
+    """
+    A str.translate() table that doubles wide characters and keeps the others,
+    so that the length of a translated text is its display width
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        translation = char * _WIDTHS[char]
+        self[code] = translation
+        return translation
+
+
+_WIDTHS = _WidthTable({chr(code): 1 for code in range(128)})
+_DOUBLING_TABLE = _DoublingTable()
+
+
+class DisplayWidth:
+    """
+    Computes the terminal display width of text.
+
+    Wide characters (e.g. CJK and most emoji) occupy two columns and every other character occupies one.
+    ASCII text takes a fast path, and the widths of other characters are cached after their first lookup.
+    """
+
+    ELLIPSIS = "…"
+
+    @staticmethod
+    def of(text: str) -> int:
+        """Returns the display width of a text"""
+        if text.isascii():
+            return len(text)
+        return len(text.translate(_DOUBLING_TABLE))
+
+    @staticmethod
+    def of_many(texts: list[str]) -> list[int]:
+        """Returns the display widths of a list of texts, measuring all of them in a single pass"""
+        joined = "\x00".join(texts)
+        if joined.isascii():
+            return list(map(len, texts))
+        if joined.count("\x00") != len(texts) - 1:
+            return list(map(DisplayWidth.of, texts))
+        return list(map(len, joined.translate(_DOUBLING_TABLE).split("\x00")))
+
+    @staticmethod
+    def of_char(char: str) -> int:
+        """Returns the display width of a single character"""
+        return _WIDTHS[char]
+
+    @staticmethod
+    def is_wide(char: str) -> bool:
+        """Returns whether a character occupies two columns"""
+        return _WIDTHS[char] == 2
+
+    @staticmethod
+    def truncate(text: str, max_width: int, text_width: int | None = None) -> str:
+        """
+        Truncates a text to fit in the given width, ending it with an ellipsis if it has been truncated
+        :param text: The text to truncate
+        :param max_width: The maximum display width
+        :param text_width: The display width of the text, if it is already known
+        :return: The text itself if it fits, otherwise its longest prefix that fits together with the ellipsis
+        """
+        text_width = DisplayWidth.of(text) if text_width is None else text_width
+        if text_width <= max_width:
+            return text
+        if max_width <= 0:
+            return ""
+        if text.isascii():
+            return text[:max_width - 1] + DisplayWidth.ELLIPSIS
+        width = 0
+        for index, char in enumerate(text):
+            width += _WIDTHS[char]
+            if width > max_width - 1:
+                return text[:index] + DisplayWidth.ELLIPSIS
+        return text
@@ -2,15 +2,35 @@ from .alignment import Alignment
 from .border_character_codes import BorderCharacterCodes
 from .border_style import BorderStyle
 from .cell_renderer_args import CellRendererArgs
+from .column_renderer_args import ColumnRendererArgs
 from .column_settings import ColumnSettings
+from .columnar_data import ColumnarData
+from .csv_grid_writer import CsvGridWriter
+from .grid_writer import GridWriter
+from .html_grid_writer import HtmlGridWriter
+from .markdown_grid_writer import MarkdownGridWriter
+from .output_format import OutputFormat
 # from .column import Column
 from .row_border_position import RowBorderPosition
+from .text_grid_writer import TextGridWriter
 from .grid import Grid
+from .grid_viewport import GridViewport
+from .live_grid import LiveGrid
 
 __all__ = [
     "Alignment",
     "BorderStyle",
     "CellRendererArgs",
+    "ColumnRendererArgs",
     "ColumnSettings",
+    "ColumnarData",
+    "CsvGridWriter",
     "Grid",
+    "GridViewport",
+    "GridWriter",
+    "HtmlGridWriter",
+    "LiveGrid",
+    "MarkdownGridWriter",
+    "OutputFormat",
+    "TextGridWriter",
 ]
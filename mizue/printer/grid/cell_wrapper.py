@@ -0,0 +1,82 @@
+from functools import lru_cache
+
+from mizue.printer import AnsiText, DisplayWidth
+from mizue.printer.terminal_colors import TerminalColors
+
+
+class CellWrapper:
+    """
+    Breaks the text of a cell into lines that fit in the width of its column.
+
+    Lines are broken at the last space that fits, or anywhere in a word that is longer than the width
+    (e.g. paths and URLs). Wide characters are never split, and are replaced by an ellipsis in a column of width 1.
+    A color span that is broken is closed at the end of the line and opened again on the next one,
+    so that every line can be printed on its own.
+    The lines are cached by text and width, so re-rendering a table does not wrap its cells again.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def wrap(text: str, width: int) -> tuple[str, ...]:
+        """
+        Wrap a text
+        :param text: The text of the cell, optionally with color codes
+        :param width: The maximum display width of a line
+        :return: The lines of the cell, at least one
+        """
+        if "\x1b" not in text and "\n" not in text and DisplayWidth.of(text) <= width:
+            return (text,)
+
+        lines = []
+        line: list[tuple[str, str]] = []  # (character, color codes of the character)
+        line_width = 0
+        last_space = -1
+        for char, style in CellWrapper._iter_styled_chars(text):
+            if char == "\n":
+                lines.append(line)
+                line, line_width, last_space = [], 0, -1
+                continue
+
+            char_width = DisplayWidth.of_char(char)
+            if char_width > width:  # A wide character in a column of width 1 is replaced, like when truncated
+                char, char_width = DisplayWidth.ELLIPSIS, 1
+            if line_width + char_width > width and len(line) > 0:
+                if char == " ":  # The line is full, and breaks at the space that overflows it
+                    lines.append(line)
+                    line, line_width, last_space = [], 0, -1
+                    continue
+                if last_space >= 0:
+                    lines.append(line[:last_space])
+                    line = line[last_space + 1:]
+                else:
+                    lines.append(line)
+                    line = []
+                line_width = sum(DisplayWidth.of_char(line_char) for line_char, _ in line)
+                last_space = -1
+
+            line.append((char, style))
+            line_width += char_width
+            if char == " ":
+                last_space = len(line) - 1
+        lines.append(line)
+        return tuple(CellWrapper._join_styled_chars(line) for line in lines)
+
+    @staticmethod
+    def _iter_styled_chars(text: str):
+        for style, span_text, _ in AnsiText.parse(text):
+            for char in span_text:
+                yield char, style
+
+    @staticmethod
+    def _join_styled_chars(chars: list[tuple[str, str]]) -> str:
+        parts = []
+        index = 0
+        while index < len(chars):
+            style = chars[index][1]
+            end = index
+            while end < len(chars) and chars[end][1] == style:
+                end += 1
+            text = "".join(char for char, _ in chars[index:end])
+            parts.append(f"{style}{text}{TerminalColors.END_CHAR}" if style else text)
+            index = end
+        return "".join(parts)
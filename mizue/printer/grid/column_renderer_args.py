@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ColumnRendererArgs:
+    cells: list[str]
+    index: int
+    is_header: bool
+    width: int
@@ -1,11 +1,13 @@
 from collections.abc import Callable
 from typing import TypedDict, NotRequired
 
-from mizue.printer.grid import Alignment, CellRendererArgs
+from mizue.printer.grid import Alignment, CellRendererArgs, ColumnRendererArgs
 
 
 class ColumnSettings(TypedDict):
     alignment: NotRequired[Alignment]
+    batch_renderer: NotRequired[Callable[[ColumnRendererArgs], list[str]]]
     renderer: NotRequired[Callable[[CellRendererArgs], str]]
     title: str
     width: NotRequired[int]
+    wrap: NotRequired[bool]
@@ -0,0 +1,86 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable
+
+_Measure = Callable[[list[str]], list[int]]
+
+
+class ColumnarData(Sequence):
+    """
+    A row view over column-oriented data.
+
+    Rows are assembled on access, so the data is never copied into a list of rows.
+    The maximum display width of a column is calculated in bulk: vectorized for NumPy arrays,
+    and with a single ASCII check over the whole column for other sequences, so that the per-character
+    width calculation only runs for the distinct values of columns that contain non-ASCII characters.
+    """
+
+    def __init__(self, columns: list[Sequence[Any]]):
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise ValueError("All the columns must have the same length")
+        self._columns = columns
+        self._length = lengths.pop() if len(lengths) > 0 else 0
+
+    def __getitem__(self, index: int) -> list[Any]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        return [column[index] for column in self._columns]
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def columns(self) -> list[Sequence[Any]]:
+        return self._columns
+
+    @staticmethod
+    def from_object(data: Any) -> "ColumnarData | None":
+        """
+        Create a row view over column-oriented data
+        :param data: A mapping of column name to values (e.g. a dict of lists or NumPy arrays),
+            a pandas DataFrame or a pyarrow Table. The columns are used in their order in the data.
+        :return: The row view, or None if the data is not column-oriented
+        """
+        if isinstance(data, ColumnarData):
+            return data
+        if isinstance(data, Mapping):
+            return ColumnarData(list(data.values()))
+        if hasattr(data, "iloc") and hasattr(data, "shape"):  # pandas DataFrame
+            return ColumnarData([data.iloc[:, index].to_numpy() for index in range(data.shape[1])])
+        if hasattr(data, "column_names") and hasattr(data, "column"):  # pyarrow Table
+            return ColumnarData([data.column(index).to_pylist() for index in range(len(data.column_names))])
+        return None
+
+    def get_max_width(self, index: int, measure: _Measure) -> int:
+        """
+        Calculate the maximum display width of the cells of a column
+        :param index: The index of the column
+        :param measure: The function that calculates the widths of a list of cells
+        :return: The maximum width
+        """
+        values = self._columns[index]
+        if getattr(getattr(values, "dtype", None), "kind", "") in "biufU" and getattr(values, "ndim", 0) == 1:
+            return ColumnarData._get_max_width_of_array(values, measure)
+        cells = list(map(str, values))
+        if len(cells) == 0:
+            return 0
+        if "".join(cells).isascii():
+            return max(map(len, cells))
+        # Equal cells have equal widths, so every distinct value is measured only once
+        return max(measure(list(set(cells))))
+
+    @staticmethod
+    def _get_max_width_of_array(values, measure: _Measure) -> int:
+        import numpy
+
+        if len(values) == 0:
+            return 0
+        cells = values.astype(str)
+        lengths = numpy.char.str_len(cells)
+        if values.dtype.kind != "U" or cells.dtype.itemsize == 0:  # Numbers are always ASCII
+            return int(lengths.max())
+        code_points = cells.view(numpy.uint32).reshape(len(cells), -1)
+        non_ascii = (code_points > 127).any(axis=1)
+        max_width = int(lengths[~non_ascii].max()) if not non_ascii.all() else 0
+        non_ascii_cells = list(set(cells[non_ascii].tolist()))
+        return max(max_width, max(measure(non_ascii_cells), default=0))
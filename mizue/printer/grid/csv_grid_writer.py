@@ -0,0 +1,22 @@
+import csv
+from typing import TYPE_CHECKING, TextIO
+
+from .grid_writer import GridWriter
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+
+class CsvGridWriter(GridWriter):
+    """Writes a grid as CSV, with the column titles as the first row"""
+
+    def __init__(self, dialect: str = "excel"):
+        """
+        :param dialect: The csv dialect of the output
+        """
+        self.dialect = dialect
+
+    def write(self, grid: "Grid", file: TextIO, colors: bool) -> None:
+        writer = csv.writer(file, dialect=self.dialect)
+        writer.writerow([column.title for column in grid.columns])
+        writer.writerows(grid._iter_plain_rows())
@@ -1,27 +1,86 @@
+import itertools
 import os
 import re
-from math import ceil, floor
-from typing import Callable
-
-from wcwidth import wcswidth, wcwidth
-
-from mizue.printer import Printer
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import Any, Callable, TextIO
+
+from mizue.printer import AnsiText, ColorMode, DisplayWidth, Printer, Style, Terminal
 from mizue.util import Utility
-from .alignment import Alignment
 from .border_character_codes import BorderCharacterCodes
 from .border_style import BorderStyle
 from .cell_renderer_args import CellRendererArgs
+from .cell_wrapper import CellWrapper
 from .column import Column
 from .column_settings import ColumnSettings
+from .columnar_data import ColumnarData
+from .csv_grid_writer import CsvGridWriter
+from .grid_writer import GridWriter
+from .grid_viewport import GridViewport
+from .html_grid_writer import HtmlGridWriter
+from .indexed_rows import IndexedRows
+from .markdown_grid_writer import MarkdownGridWriter
+from .output_format import OutputFormat
+from .render_plan import RenderPlan
+from .sort_index import SortIndex
 from .row_border_position import RowBorderPosition
+from .text_grid_writer import TextGridWriter
+
+_VARIATION_SELECTOR_PATTERN = re.compile("[\ufe00-\ufe0f]")
+_HEADER_STYLE = Style.get('#FFCC75')
+_MAX_PENDING_CHUNKS = 2 * (os.cpu_count() or 1)
+_WRITERS = {
+    OutputFormat.TEXT: TextGridWriter(),
+    OutputFormat.CSV: CsvGridWriter(),
+    OutputFormat.MARKDOWN: MarkdownGridWriter(),
+    OutputFormat.HTML: HtmlGridWriter(),
+}
+
+
+class _ColorlessRenderer:
+    """Removes the color codes from the output of a cell or batch renderer (a class, so that it can be pickled)"""
+
+    def __init__(self, renderer: Callable):
+        self._renderer = renderer
+
+    def __call__(self, args):
+        rendered = self._renderer(args)
+        if isinstance(rendered, list):
+            return [AnsiText.strip(text) for text in rendered]
+        return AnsiText.strip(rendered)
 
 
 class Grid:
-    def __init__(self, columns: list[ColumnSettings], data: list[list[str]]):
+    def __init__(self, columns: list[ColumnSettings], data: list[list[str]] | Any):
+        """
+        :param columns: The settings of the columns
+        :param data: A list of rows, or column-oriented data: a mapping of column name to values
+            (e.g. a dict of lists or NumPy arrays), a pandas DataFrame or a pyarrow Table
+        """
+        self._column_settings: list[ColumnSettings] = columns
         self._columns = []
+        self._data: Sequence[list[str]] = []
+        self._rows: IndexedRows | None = None
+        self._sort_indexes: dict[int, SortIndex] = {}
         self.border_color = None
         self.border_style = BorderStyle.BASIC
-        self.cell_renderer: Callable[[CellRendererArgs], str] = lambda args: Grid._get_default_cell_renderer(args)
+        self.cell_renderer: Callable[[CellRendererArgs], str] = Grid._get_default_cell_renderer
+
+        self.wrap = False
+        """Whether long cells are wrapped across several lines instead of being truncated, for the columns
+        that do not set wrap themselves"""
+
+        self.render_chunk_size = 1000
+        """The number of rows rendered at once when rendering in batches or with render_executor"""
+
+        self.render_executor: Executor | None = None
+        """
+        A thread or process pool that renders the cells of chunks of rows in parallel before they are laid out.
+        A process pool requires the renderers to be picklable (e.g. module-level functions).
+        """
         self.data = data
         if len(columns) > 0:
             self._prepare_columns(columns)
@@ -34,6 +93,30 @@ class Grid:
     def columns(self, value: list[ColumnSettings]) -> None:
         self._prepare_columns(value)
 
+    @property
+    def data(self) -> Sequence[list[str]]:
+        return self._data
+
+    @data.setter
+    def data(self, value: list[list[str]] | Any) -> None:
+        columnar_data = ColumnarData.from_object(value)
+        self._data = columnar_data if columnar_data is not None else value
+        self._rows = None
+        self._sort_indexes = {}
+
+    @property
+    def rows(self) -> Sequence[list[str]]:
+        """The rows in the order they are printed, after sorting, filtering and grouping"""
+        return self._data if self._rows is None else self._rows
+
+    def create_sort_index(self, column: int | str) -> None:
+        """
+        Create a sort index for a column, which is reused by every later sort on the column until the data is replaced
+        :param column: The index or the title of the column
+        """
+        index = self._get_column_index(column)
+        self._sort_indexes[index] = SortIndex(self._get_column_values(index))
+
     def fill_screen(self):
         terminal_width = Utility.get_terminal_width()
         total_width = sum([column.width for column in self.columns]) + (4 * len(self.columns))
@@ -42,54 +125,197 @@ class Grid:
             for column in self.columns:
                 column.width += int(remaining_width / len(self.columns))
 
+    def filter(self, predicate: Callable[[list[Any]], bool]) -> None:
+        """
+        Keep only the rows for which the predicate returns True.
+        Filters are applied on top of the current order, so they can be combined with sort and each other.
+        :param predicate: A function that takes a row and returns whether it is kept
+        """
+        data = self._data
+        self._set_row_entries([index for index in self._get_row_indexes() if predicate(data[index])])
+
+    def group_by(self, column: int | str, aggregates: dict[int | str, Callable[[list[Any]], Any]] | None = None,
+                 label: str = "Total") -> None:
+        """
+        Group the rows by the values of a column, keeping the groups in the order they first appear.
+        Sort by the column first to print the groups in order.
+        :param column: The index or the title of the column
+        :param aggregates: A function for each column (by index or title) that takes the values of a group
+            and returns the value printed in the footer row of the group. If not given, no footer rows are added.
+        :param label: The text printed in the grouped column of the footer rows
+        """
+        index = self._get_column_index(column)
+        values = self._get_column_values(index)
+        groups: dict[Any, list[int]] = {}
+        for row_index in self._get_row_indexes():
+            groups.setdefault(values[row_index], []).append(row_index)
+
+        # The values of every aggregated column are fetched once, not once per group
+        aggregated_columns = []
+        for aggregated_column, aggregate in (aggregates or {}).items():
+            aggregated_index = self._get_column_index(aggregated_column)
+            aggregated_columns.append((aggregated_index, aggregate, self._get_column_values(aggregated_index)))
+
+        entries: list[int | list[Any]] = []
+        for row_indexes in groups.values():
+            entries.extend(row_indexes)
+            if aggregates:
+                entries.append(self._create_footer_row(index, row_indexes, aggregated_columns, label))
+        self._set_row_entries(entries)
+
     def print(self) -> None:
         """Print the grid"""
-        print(self._buffer())
+        Printer.write(self._buffer() + "\n")
+
+    def print_stream(self, rows: Iterable[list[str]], sample_size: int = 100, batch_size: int = 100) -> None:
+        """
+        Print the grid while the rows are being produced, without keeping them in memory.
+
+        The widths of the columns without a fixed width are calculated from the first sample_size rows,
+        and the cells of later rows that do not fit are truncated. The widths of the grid itself are not changed.
+        The header is printed as soon as the sample has been read, and the rows are printed in batches.
+        :param rows: An iterable of rows (e.g. a generator)
+        :param sample_size: The number of rows used to calculate the column widths.
+            Set to 0 to calculate the widths from the column titles only.
+        :param batch_size: The number of rows printed at once
+        """
+        iterator = iter(rows)
+        sample = list(itertools.islice(iterator, sample_size))
+        with self._use_columns(self._create_columns(self._column_settings, sample)):
+            lines = self._iter_lines(itertools.chain(sample, iterator))
+            self._write_lines(list(itertools.islice(lines, 3)))  # Top border, header and separator
+            while True:
+                batch = list(itertools.islice(lines, batch_size))
+                if len(batch) == 0:
+                    break
+                self._write_lines(batch)
+
+    def reset_view(self) -> None:
+        """Undo sorting, filtering and grouping, printing the rows in their original order"""
+        self._rows = None
+        self._prepare_columns(self._column_settings)
+
+    def sort(self, columns: int | str | list[int | str], descending: bool | list[bool] = False) -> None:
+        """
+        Sort the rows by one or more columns. Rows with equal values keep their order in the data.
+        Sorting removes the footer rows of group_by, and uses the sort indexes created with create_sort_index.
+        :param columns: The index or the title of the column, or a list of them from the most significant
+        :param descending: Whether to sort in descending order, for all the columns or for each of them
+        """
+        columns = columns if isinstance(columns, list) else [columns]
+        descending = descending if isinstance(descending, list) else [descending] * len(columns)
+        if len(descending) != len(columns):
+            raise ValueError("The number of sort directions must match the number of columns")
+
+        # Sort by the least significant column first, every later (stable) sort keeping the order of equal values
+        row_indexes = self._get_row_indexes()
+        row_indexes = list(range(len(self._data))) if len(row_indexes) == len(self._data) else sorted(row_indexes)
+        for sort_pass, (column, reverse) in enumerate(reversed(list(zip(columns, descending)))):
+            index = self._get_column_index(column)
+            sort_index = self._sort_indexes.get(index)
+            if sort_index is None:
+                row_indexes.sort(key=self._get_column_values(index).__getitem__, reverse=reverse)
+            elif sort_pass == 0:
+                row_indexes = sort_index.sort(row_indexes, reverse)
+            else:
+                row_indexes.sort(key=sort_index.ranks.__getitem__, reverse=reverse)
+        self._rows = IndexedRows(self._data, row_indexes)
+
+    def write(self, file: TextIO | None = None, output_format: OutputFormat | GridWriter = OutputFormat.TEXT,
+              colors: bool | None = None) -> None:
+        """
+        Write the grid to a file-like object, row by row
+        :param file: The file to write to. Defaults to the standard output.
+        :param output_format: The format of the output, or a GridWriter that writes it
+        :param colors: Whether the text output is colored. Defaults to whether the file is a terminal.
+            No color codes are generated at all when it is False, and the other formats are never colored.
+        """
+        file = sys.stdout if file is None else file
+        colors = file.isatty() if colors is None and hasattr(file, "isatty") else bool(colors)
+        writer = output_format if isinstance(output_format, GridWriter) else _WRITERS[output_format]
+        writer.write(self, file, colors)
+
+    def view(self) -> None:
+        """
+        Browse the grid interactively, rendering only the rows that fit in the terminal.
+        See GridViewport.show for the keys.
+        """
+        GridViewport(self).show()
 
     def _buffer(self) -> str:
-        buffer = [self._create_row_border(RowBorderPosition.TOP), os.linesep]
-        title_list = [column.title for column in self.columns]
-        buffer.append(self._create_row(title_list, True))
-        buffer.append(os.linesep)
-        buffer.append(self._create_row_border(RowBorderPosition.MIDDLE))
-        buffer.append(os.linesep)
-        for row in self.data:
-            buffer.append(self._create_row(row, False))
-            buffer.append(os.linesep)
-        buffer.append(self._create_row_border(RowBorderPosition.BOTTOM))
-        return "".join(buffer)
-
-    def _create_row(self, row: list[str], is_header_row: bool) -> str:
+        return os.linesep.join(self._iter_lines(self.rows))
+
+    def _compile_render_plan(self, colors: bool = True) -> RenderPlan:
+        colors = colors and Terminal.color_mode is not ColorMode.NONE
         border_style = self._get_border_style()
-        row_buffer = []
+        vertical_border = Printer.format_hex(border_style.VERTICAL, self.border_color) \
+            if self.border_color and colors else border_style.VERTICAL
+        plan = RenderPlan(columns=self.columns,
+                          renderers=[self._get_cell_renderer(column) for column in self.columns],
+                          vertical_border=vertical_border,
+                          top_border=self._create_row_border(RowBorderPosition.TOP, colors),
+                          middle_border=self._create_row_border(RowBorderPosition.MIDDLE, colors),
+                          bottom_border=self._create_row_border(RowBorderPosition.BOTTOM, colors),
+                          wraps=[self.wrap if column.wrap is None else column.wrap for column in self.columns])
+        if not colors:
+            # The default renderer only adds colors, and the colors added by the other renderers are removed
+            plan.renderers = [None if renderer is Grid._get_default_cell_renderer else
+                              _ColorlessRenderer(renderer) if renderer is not None else None
+                              for renderer in plan.renderers]
+            plan.batch_renderers = [_ColorlessRenderer(renderer) if renderer is not None else None
+                                    for renderer in plan.batch_renderers]
+        return plan
+
+    def _create_columns(self, column_data: list[ColumnSettings],
+                        rows: Iterable[list[str]] | None = None) -> list[Column]:
+        rows = self.rows if rows is None else rows
+        columns: list[Column] = []
+        for i, column_setting in enumerate(column_data):
+            column = Column(settings=column_setting)
+            column.index = i
+            column.width = column_setting["width"] if "width" in column_setting \
+                else self._find_max_cell_width(column, rows)
+            columns.append(column)
+        Grid._resize_columns_to_fit(columns)
+        return columns
+
+    def _create_row(self, row: list[str], is_header_row: bool, plan: RenderPlan | None = None) -> str:
+        plan = self._compile_render_plan() if plan is None else plan
+        if plan.has_batch_renderers:
+            return self._layout_row(plan.render_cells([row], is_header_row)[0], plan)
+
+        vertical_border = plan.vertical_border
+        row_buffer = [vertical_border]
         for index, cell_value in enumerate(row):
             cell = str(cell_value)
-            column = self.columns[index]
+            column_width = plan.widths[index]
 
-            renderer = self._get_cell_renderer(column)
+            renderer = plan.renderers[index]
             if renderer is not None:
-                rendered_cell = renderer(CellRendererArgs(cell=cell, index=index, is_header=is_header_row,
-                                                          width=column.width))
-
-                rendered_cell = self._format_cell_with_colors(rendered_cell, column.width)
+                args = plan.args[index]
+                args.cell = cell
+                args.is_header = is_header_row
+                rendered_cell, cell_width = AnsiText.fit(renderer(args), column_width)
             else:
-                rendered_cell = self._format_cell_with_colors(cell, column.width)
-
-            border = Printer.format_hex(border_style.VERTICAL, self.border_color) \
-                if self.border_color else border_style.VERTICAL
-            if index == 0:
-                row_buffer.append(f"{border}")
+                rendered_cell, cell_width = AnsiText.fit(cell, column_width)
 
-            row_buffer.append(" ")
-            row_buffer.append(self._get_left_cell_space(column, self._get_raw_cell_text_after_rendering(rendered_cell)))
+            left_space, right_space = plan.paddings[index][min(cell_width, column_width)]
+            row_buffer.append(left_space)
             row_buffer.append(rendered_cell)
-            row_buffer.append(
-                self._get_right_cell_space(column, self._get_raw_cell_text_after_rendering(rendered_cell)))
-            row_buffer.append(" ")
-            row_buffer.append(border)
+            row_buffer.append(right_space)
+            row_buffer.append(vertical_border)
         return "".join(row_buffer)
 
-    def _create_row_border(self, position):
+    def _create_footer_row(self, group_column: int, row_indexes: list[int],
+                           aggregated_columns: list[tuple[int, Callable[[list[Any]], Any], Sequence[Any]]],
+                           label: str) -> list[Any]:
+        footer = [""] * len(self.columns)
+        footer[group_column] = label
+        for index, aggregate, values in aggregated_columns:
+            footer[index] = aggregate([values[row_index] for row_index in row_indexes])
+        return footer
+
+    def _create_row_border(self, position, colors: bool = True):
         dash_list = []
         border_style = self._get_border_style()
         if position is RowBorderPosition.TOP:
@@ -110,92 +336,19 @@ class Grid:
             if index != len(self.columns) - 1:
                 dash_list.append(middle)
         dash_list.append(right)
-        return Printer.format_hex("".join(dash_list), self.border_color) if self.border_color else "".join(dash_list)
+        return Printer.format_hex("".join(dash_list), self.border_color) if self.border_color and colors \
+            else "".join(dash_list)
 
-    def _find_max_cell_width(self, column: Column) -> int:
+    def _find_max_cell_width(self, column: Column, rows: Iterable[list[str]]) -> int:
         max_width = len(column.title)
-        for row in self.data:
+        if isinstance(rows, ColumnarData):
+            return max(max_width, rows.get_max_width(column.index, Grid._get_cell_widths))
+        for row in rows:
             cell = str(row[column.index])
-            length = 0
-            for char in str(cell):
-                if Grid._is_wide_char(char):
-                    length += 2
-                else:
-                    length += 1
-            length = length + 1 if Grid._has_variation_selector(cell) else length
+            length = len(cell) if cell.isascii() else Grid._get_cell_width(cell)
             max_width = max(max_width, length)
         return max_width
 
-    def _format_cell_with_colors(self, rendered_cell: str, column_width: int) -> str:
-        color_parts = self._split_text_into_color_parts(rendered_cell)
-        if len(color_parts) == 0:
-            return self._format_long_cell(rendered_cell, column_width)
-        else:
-            processed_width = 0
-            formatted_parts = []
-            for color_part in color_parts:
-                text = color_part[1]
-                text_width = wcswidth(text)
-                if processed_width + text_width <= column_width:
-                    formatted_text = f"{color_part[0]}{text}{color_part[2]}"
-                    formatted_parts.append(formatted_text)
-                    processed_width += text_width
-                    if processed_width == column_width:
-                        break
-                else:
-                    visible_text = self._format_long_cell(text, column_width - processed_width)
-                    formatted_text = f"{color_part[0]}{visible_text}{color_part[2]}"
-                    formatted_parts.append(formatted_text)
-                    break
-            return "".join(formatted_parts)
-
-    @staticmethod
-    def _format_long_cell(cell: str, col_width: int) -> str:
-        if col_width <= 3:
-            if col_width == 1:
-                return cell[0] if wcwidth(cell[0]) == 1 else "…"
-            if col_width == 2:
-                if len(cell) == 1:
-                    return cell[0] if wcwidth(cell[0]) == 1 else "…"
-                return cell[0] + cell[1] if wcwidth(cell[0]) == 1 and wcwidth(cell[1]) == 1 else "…"
-            if col_width == 3:
-                if wcwidth(cell[0]) == 2:
-                    return cell[0] + "…"
-                if wcwidth(cell[0]) == 1 and wcwidth(cell[1]) == 1:
-                    return cell[0] + cell[1] + "…"
-                if wcwidth(cell[0]) == 1 and wcwidth(cell[1]) == 2:
-                    return "…"
-                if wcwidth(cell[0]) == 1 and wcwidth(cell[1]) == 0:  # symbol + variation selector
-                    return cell[0] + "…"
-
-        text_width = 0
-        text_length = 0
-        for char in cell:
-            text_length += 1
-            if Grid._is_wide_char(char):
-                text_width += 2
-            else:
-                text_width += 1
-            if text_width == col_width - 3 or text_width == col_width - 2:
-                break
-
-        has_any_wide_char = any([True for char in cell if Grid._is_wide_char(char)])
-        if not has_any_wide_char:
-            if len(cell) <= col_width:
-                return cell
-            return cell[:col_width - 1] + "…"
-        else:
-            first_part = cell[:text_length]
-            first_part_original = cell[:text_length]
-            first_part_terminal_width = Grid._get_terminal_width_of_cell(first_part)
-            full_width = Grid._get_terminal_width_of_cell(cell)
-            while first_part_terminal_width > col_width - 1:
-                first_part = first_part[:-1]
-                first_part_terminal_width = Grid._get_terminal_width_of_cell(first_part)
-            return first_part + "…" \
-                if len(first_part) < len(first_part_original) or full_width > col_width \
-                else first_part
-
     def _get_border_style(self):
         if self.border_style == BorderStyle.SINGLE:
             return BorderCharacterCodes.Single
@@ -213,90 +366,157 @@ class Grid:
         return self.cell_renderer
 
     @staticmethod
-    def _get_default_cell_renderer(args: CellRendererArgs) -> str:
-        if args.is_header:
-            return Printer.format_hex(args.cell, '#FFCC75')
-        return args.cell
-
-    @staticmethod
-    def _get_left_cell_space(column: Column, cell: str) -> str:
-        cell_terminal_width = Grid._get_terminal_width_of_cell(cell)
-        if column.alignment == Alignment.RIGHT:
-            return "".join([" "] * (column.width - cell_terminal_width))
-        elif column.alignment == Alignment.CENTER:
-            return "".join([" "] * int(floor((column.width - cell_terminal_width) / 2)))
-        return ""
-
-    @staticmethod
-    def _get_raw_cell_text_after_rendering(rendered_cell: str) -> str:
-        # remove all the color codes and other formatting codes, also remove ansi escape codes
-        return re.sub(r"\x1b\[[0-9;]*m", "", rendered_cell)
+    def _get_cell_width(cell: str) -> int:
+        width = DisplayWidth.of(cell)
+        return width + 1 if Grid._has_variation_selector(cell) else width
 
     @staticmethod
-    def _get_right_cell_space(column: Column, cell: str) -> str:
-        cell_terminal_width = Grid._get_terminal_width_of_cell(cell)
-        if column.alignment == Alignment.LEFT:
-            return "".join([" "] * (column.width - cell_terminal_width))
-        elif column.alignment == Alignment.CENTER:
-            return "".join([" "] * int(ceil((column.width - cell_terminal_width) / 2)))
-        return ""
+    def _get_cell_widths(cells: list[str]) -> list[int]:
+        widths = DisplayWidth.of_many(cells)
+        if _VARIATION_SELECTOR_PATTERN.search("".join(cells)) is None:
+            return widths
+        return [width + 1 if Grid._has_variation_selector(cell) else width for cell, width in zip(cells, widths)]
+
+    def _get_column_index(self, column: int | str) -> int:
+        if isinstance(column, int):
+            if not 0 <= column < len(self.columns):
+                raise ValueError(f"There is no column at index {column}")
+            return column
+        for index, grid_column in enumerate(self.columns):
+            if grid_column.title == column:
+                return index
+        raise ValueError(f"There is no column titled '{column}'")
+
+    def _get_column_values(self, index: int) -> Sequence[Any]:
+        if isinstance(self._data, ColumnarData):
+            return self._data.columns[index]
+        return [row[index] for row in self._data]
 
     @staticmethod
-    def _get_terminal_width_of_cell(text):
-        return sum([2 if wcswidth(char) == 2 else 1 for char in text])
+    def _get_default_cell_renderer(args: CellRendererArgs) -> str:
+        if args.is_header:
+            return _HEADER_STYLE.format(args.cell)
+        return args.cell
 
-    @staticmethod
-    def _get_visible_text(text: str, max_width: int) -> str:
-        current_width = 0
-        for ch in text:
-            if Grid._is_wide_char(ch):
-                current_width += 2
-            else:
-                current_width += 1
-            if current_width > max_width:
-                return text[:text.index(ch)]
-        return text
+    def _get_row_indexes(self) -> list[int]:
+        return list(range(len(self._data))) if self._rows is None else self._rows.row_indexes
 
     @staticmethod
     def _has_variation_selector(text: str) -> bool:
-        return any(Grid._is_variation_selector(c) for c in text)
+        return _VARIATION_SELECTOR_PATTERN.search(text) is not None
+
+    def _iter_lines(self, rows: Iterable[list[str]], plan: RenderPlan | None = None) -> Iterator[str]:
+        plan = self._compile_render_plan() if plan is None else plan
+        create_row = self._create_row
+        yield plan.top_border
+        if plan.has_wrapping:
+            yield from self._layout_wrapped_row(plan.render_cells([[column.title for column in self.columns]], True)[0],
+                                                plan)
+        else:
+            yield create_row([column.title for column in self.columns], True, plan)
+        yield plan.middle_border
+        if self.render_executor is None and not plan.has_batch_renderers and not plan.has_wrapping:
+            for row in rows:
+                yield create_row(row, False, plan)
+        else:
+            for rendered_rows in self._render_in_chunks(rows, plan):
+                for rendered_cells in rendered_rows:
+                    if plan.has_wrapping:
+                        yield from self._layout_wrapped_row(rendered_cells, plan)
+                    else:
+                        yield self._layout_row(rendered_cells, plan)
+        yield plan.bottom_border
+
+    def _iter_plain_rows(self) -> Iterator[list[str]]:
+        # The cells of the rows as text, after rendering without colors, for the backends that do not lay them out
+        plan = self._compile_render_plan(colors=False)
+        for rendered_rows in self._render_in_chunks(self.rows, plan):
+            yield from rendered_rows
+
+    def _layout_row(self, rendered_cells: list[str], plan: RenderPlan, formatted: bool = False) -> str:
+        vertical_border = plan.vertical_border
+        row_buffer = [vertical_border]
+        for index, rendered_cell in enumerate(rendered_cells):
+            column_width = plan.widths[index]
+            if formatted:
+                formatted_cell, cell_width = rendered_cell, AnsiText.width(rendered_cell)
+            else:
+                formatted_cell, cell_width = AnsiText.fit(rendered_cell, column_width)
+            left_space, right_space = plan.paddings[index][min(cell_width, column_width)]
+            row_buffer.append(left_space)
+            row_buffer.append(formatted_cell)
+            row_buffer.append(right_space)
+            row_buffer.append(vertical_border)
+        return "".join(row_buffer)
 
-    @staticmethod
-    def _is_variation_selector(char: str) -> bool:
-        return 0xFE00 <= ord(char) <= 0xFE0F
+    def _layout_wrapped_row(self, rendered_cells: list[str], plan: RenderPlan) -> list[str]:
+        # The row is as high as its highest cell, and the lines of the other cells are left blank
+        cell_lines = []
+        for index, rendered_cell in enumerate(rendered_cells):
+            column_width = plan.widths[index]
+            cell_lines.append(CellWrapper.wrap(rendered_cell, column_width) if plan.wraps[index]
+                              else (AnsiText.truncate(rendered_cell, column_width),))
+        height = max(map(len, cell_lines))
+        if height == 1:
+            return [self._layout_row([lines[0] for lines in cell_lines], plan, formatted=True)]
+        return [self._layout_row([lines[line_index] if line_index < len(lines) else "" for lines in cell_lines],
+                                 plan, formatted=True)
+                for line_index in range(height)]
+
+    def _prepare_columns(self, column_data: list[ColumnSettings], rows: Iterable[list[str]] | None = None):
+        self._columns = self._create_columns(column_data, rows)
+        self._column_settings = column_data
+
+    def _render_in_chunks(self, rows: Iterable[list[str]], plan: RenderPlan) -> Iterator[list[list[str]]]:
+        iterator = iter(rows)
+        chunks = iter(lambda: list(itertools.islice(iterator, self.render_chunk_size)), [])
+        if self.render_executor is None:
+            for chunk in chunks:
+                yield plan.render_cells(chunk)
+            return
+
+        # Keep a few chunks ahead of the layout in the pool, without reading all the rows at once
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self.render_executor.submit(plan.render_cells, chunk))
+            if len(pending) > _MAX_PENDING_CHUNKS:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
 
     @staticmethod
-    def _is_wide_char(char: str) -> bool:
-        return wcswidth(char) > 1
-
-    def _prepare_columns(self, column_data: list[ColumnSettings]):
-        columns: list[Column] = []
-        for i, column_setting in enumerate(column_data):
-            column = Column(settings=column_setting)
-            column.index = i
-            column.width = column_setting["width"] if "width" in column_setting else self._find_max_cell_width(column)
-            columns.append(column)
-        self._columns = columns
-        self._resize_columns_to_fit()
-
-    def _resize_columns_to_fit(self):
+    def _resize_columns_to_fit(columns: list[Column]):
         terminal_width = Utility.get_terminal_width()
-        new_column_width = int(terminal_width / len(self.columns))
-        long_columns = [column for column in self.columns if column.width >= new_column_width]
+        new_column_width = int(terminal_width / len(columns))
+        long_columns = [column for column in columns if column.width >= new_column_width]
 
         remaining_width = 0
-        for column in self.columns:
+        for column in columns:
             if column.width > new_column_width:
                 column.width = new_column_width
             else:
-                remaining_width += (new_column_width - column.width - 4 * len(self.columns))
+                remaining_width += (new_column_width - column.width - 4 * len(columns))
 
         padding = int(remaining_width / len(long_columns)) if len(long_columns) > 0 else 0
         for column in long_columns:
-            column.width += padding
+            column.width = max(1, column.width + padding)  # The padding is negative when the other columns are wide
+
+    def _set_row_entries(self, entries: list[int | list[Any]]) -> None:
+        # The visible rows have changed, so the widths of the columns are calculated again
+        self._rows = IndexedRows(self._data, entries)
+        self._prepare_columns(self._column_settings)
+
+    @contextmanager
+    def _use_columns(self, columns: list[Column]) -> Iterator[None]:
+        # Renders with columns sized for other rows (e.g. a sample or a window), keeping the widths of the grid
+        grid_columns = self._columns
+        self._columns = columns
+        try:
+            yield
+        finally:
+            self._columns = grid_columns
 
     @staticmethod
-    def _split_text_into_color_parts(text: str) -> list[tuple[str, str, str]]:
-        matcher = re.compile(r"(\x1b\[[0-9;]*m)(.*?)(\x1b\[00m)")
-        groups = matcher.findall(text)
-        return groups if groups else []
+    def _write_lines(lines: list[str]) -> None:
+        if len(lines) > 0:
+            Printer.write(os.linesep.join(lines) + os.linesep)
@@ -0,0 +1,224 @@
+import os
+import re
+import sys
+from collections.abc import Sequence
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+from mizue.printer import Printer
+from mizue.util import Utility
+from .column import Column
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+_POSIX_KEYS = {
+    "\x1b[A": "up", "\x1bOA": "up",
+    "\x1b[B": "down", "\x1bOB": "down",
+    "\x1b[5~": "page_up", "\x1b[6~": "page_down",
+    "\x1b[H": "home", "\x1bOH": "home", "\x1b[1~": "home", "\x1b[7~": "home",
+    "\x1b[F": "end", "\x1bOF": "end", "\x1b[4~": "end", "\x1b[8~": "end",
+}
+_ESCAPE_SEQUENCE_PATTERN = re.compile(r"\x1b(\[[0-9;]*[A-Za-z~]|O[A-Za-z])")
+_WINDOWS_KEYS = {"H": "up", "P": "down", "I": "page_up", "Q": "page_down", "G": "home", "O": "end"}
+
+
+class GridViewport:
+    """
+    A scrollable window over the rows of a grid.
+
+    Only the rows that fit in the terminal are fetched from the data (by index, so any sequence works)
+    and rendered, and the widths of the columns without a fixed width are calculated from those rows only,
+    without changing the widths of the grid itself.
+    The cost of a frame therefore depends on the height of the terminal, not on the number of rows.
+    """
+
+    _CHROME_HEIGHT = 5
+    """The number of lines that are not rows: the top border, the header, the separator, the bottom border
+    and the status line"""
+
+    def __init__(self, grid: "Grid", data: Sequence[list[str]] | None = None):
+        """
+        :param grid: The grid whose columns, borders and renderers are used
+        :param data: The rows to browse. Any object that supports len() and indexing can be used.
+            Defaults to the rows of the grid, after sorting, filtering and grouping.
+        """
+        self.grid = grid
+        self._data = data
+
+        self.height: int | None = None
+        """The number of visible rows. Defaults to the rows that fit in the terminal."""
+
+        self.offset = 0
+        """The index of the first visible row"""
+
+        self._columns: list[Column] = []
+        self._pending_row = ""
+        self._window: tuple[int, int, int] | None = None
+
+    @property
+    def data(self) -> Sequence[list[str]]:
+        """The browsed rows: the given data, or the rows of the grid in their current order"""
+        return self.grid.rows if self._data is None else self._data
+
+    @property
+    def row_count(self) -> int:
+        return len(self.data)
+
+    @property
+    def visible_row_count(self) -> int:
+        if self.height is not None:
+            return max(1, self.height)
+        return max(1, Utility.get_terminal_height() - GridViewport._CHROME_HEIGHT)
+
+    def end(self) -> None:
+        """Scroll to the last page"""
+        self.scroll_to(self.row_count)
+
+    def home(self) -> None:
+        """Scroll to the first row"""
+        self.scroll_to(0)
+
+    def page_down(self) -> None:
+        self.scroll(self.visible_row_count)
+
+    def page_up(self) -> None:
+        self.scroll(-self.visible_row_count)
+
+    def render(self) -> str:
+        """Render the visible window of the grid, followed by a status line"""
+        self._clamp_offset()
+        end = min(self.offset + self.visible_row_count, self.row_count)
+        data = self.data
+        rows = [data[index] for index in range(self.offset, end)]
+
+        window = (self.offset, end, Utility.get_terminal_width())
+        if window != self._window:
+            self._columns = self.grid._create_columns(self.grid._column_settings, rows)
+            self._window = window
+
+        with self.grid._use_columns(self._columns):
+            lines = list(self.grid._iter_lines(rows))
+        lines.append(self._get_status_line(end))
+        return os.linesep.join(lines)
+
+    def scroll(self, rows: int) -> None:
+        """
+        Scroll the window
+        :param rows: The number of rows to scroll by. Negative values scroll up.
+        """
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, row: int) -> None:
+        """
+        Jump to a row, making it the first visible row if possible
+        :param row: The index of the row
+        """
+        self.offset = row
+        self._clamp_offset()
+
+    def show(self) -> None:
+        """
+        Browse the grid interactively until 'q' or Escape is pressed.
+
+        The arrow keys (or j/k) scroll by one row, Page Up/Page Down (or b/space) by one page,
+        and Home/End (or g/G) jump to the first and last rows. Typing a row number followed by Enter jumps to that row.
+        If the output is not a terminal, the first window is printed once.
+        """
+        if not (sys.stdin.isatty() and sys.stdout.isatty()):
+            Printer.write(self.render() + "\n")
+            return
+
+        with GridViewport._interactive_terminal() as read_keys:
+            running = True
+            while running:
+                self._draw()
+                # Keys that arrive together (e.g. a held arrow key) are applied before the next frame is drawn
+                running = all([self._handle_key(key) for key in read_keys()])
+
+    def _clamp_offset(self) -> None:
+        self.offset = max(0, min(self.offset, self.row_count - self.visible_row_count))
+
+    def _draw(self) -> None:
+        lines = self.render().split(os.linesep)
+        Printer.write("\x1b[H" + "".join(f"{line}\x1b[K\r\n" for line in lines[:-1]) + lines[-1] + "\x1b[K\x1b[J")
+        Printer.flush()
+
+    def _get_status_line(self, end: int) -> str:
+        position = f"Rows {self.offset + 1 if end > 0 else 0}-{end} of {self.row_count}"
+        if self._pending_row:
+            return f"{position}  Go to row: {self._pending_row}"
+        return f"{position}  (arrows: scroll, PgUp/PgDn: page, Home/End, <row> Enter: jump, q: quit)"
+
+    def _handle_key(self, key: str) -> bool:
+        if key.isdigit():
+            self._pending_row += key
+        elif key in ("\r", "\n") and self._pending_row:
+            self.scroll_to(int(self._pending_row) - 1)
+            self._pending_row = ""
+        elif key in ("\x7f", "\b"):
+            self._pending_row = self._pending_row[:-1]
+        elif key in ("q", "Q", "\x1b", "\x03"):
+            return False
+        elif key in ("up", "k"):
+            self.scroll(-1)
+        elif key in ("down", "j"):
+            self.scroll(1)
+        elif key in ("page_up", "b"):
+            self.page_up()
+        elif key in ("page_down", " "):
+            self.page_down()
+        elif key in ("home", "g"):
+            self.home()
+        elif key in ("end", "G"):
+            self.end()
+        return True
+
+    @staticmethod
+    @contextmanager
+    def _interactive_terminal() -> Iterator:
+        # Draw on the alternate screen with a hidden cursor, and restore the terminal afterwards
+        Printer.write("\x1b[?1049h\x1b[?25l")
+        Printer.flush()
+        try:
+            if os.name == "nt":
+                yield GridViewport._read_windows_keys
+            else:
+                import termios
+                import tty
+                fd = sys.stdin.fileno()
+                attributes = termios.tcgetattr(fd)
+                try:
+                    tty.setcbreak(fd)
+                    yield lambda: GridViewport._read_posix_keys(fd)
+                finally:
+                    termios.tcsetattr(fd, termios.TCSADRAIN, attributes)
+        finally:
+            Printer.write("\x1b[?25h\x1b[?1049l")
+            Printer.flush()
+
+    @staticmethod
+    def _read_posix_keys(fd: int) -> list[str]:
+        # An escape sequence arrives in a single read, so it can be told apart from a lone Escape key press
+        text = os.read(fd, 1024).decode(errors="ignore")
+        keys = []
+        index = 0
+        while index < len(text):
+            match = _ESCAPE_SEQUENCE_PATTERN.match(text, index)
+            if match is None:
+                keys.append(text[index])
+                index += 1
+            else:
+                keys.append(_POSIX_KEYS.get(match.group(), ""))
+                index = match.end()
+        return keys
+
+    @staticmethod
+    def _read_windows_keys() -> list[str]:
+        import msvcrt
+        keys = []
+        while True:
+            key = msvcrt.getwch()
+            keys.append(_WINDOWS_KEYS.get(msvcrt.getwch(), "") if key in ("\x00", "\xe0") else key)
+            if not msvcrt.kbhit():
+                return keys
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+
+class GridWriter(ABC):
+    """
+    The base class of the output backends of Grid.
+
+    A writer gets the grid with its columns already laid out, and writes the rows to the file as it goes,
+    so that the whole output is never built in memory.
+    """
+
+    @abstractmethod
+    def write(self, grid: "Grid", file: TextIO, colors: bool) -> None:
+        """
+        Write a grid to a file
+        :param grid: The grid to write
+        :param file: The file-like object to write to
+        :param colors: Whether the output can contain color codes
+        """
@@ -0,0 +1,25 @@
+from html import escape
+from typing import TYPE_CHECKING, TextIO
+
+from .alignment import Alignment
+from .grid_writer import GridWriter
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+
+class HtmlGridWriter(GridWriter):
+    """Writes a grid as an HTML table, keeping the alignment of the columns"""
+
+    _STYLES = {Alignment.LEFT: "", Alignment.CENTER: ' style="text-align: center"',
+               Alignment.RIGHT: ' style="text-align: right"'}
+
+    def write(self, grid: "Grid", file: TextIO, colors: bool) -> None:
+        styles = [HtmlGridWriter._STYLES[column.alignment] for column in grid.columns]
+        file.write("<table>\n<thead>\n<tr>")
+        file.write("".join(f"<th{style}>{escape(column.title)}</th>" for column, style in zip(grid.columns, styles)))
+        file.write("</tr>\n</thead>\n<tbody>\n")
+        for cells in grid._iter_plain_rows():
+            file.write("<tr>" + "".join(f"<td{style}>{escape(cell)}</td>" for cell, style in zip(cells, styles))
+                       + "</tr>\n")
+        file.write("</tbody>\n</table>\n")
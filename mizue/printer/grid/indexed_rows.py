@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+from typing import Any
+
+
+class IndexedRows(Sequence):
+    """
+    A reordered view over the rows of a grid.
+
+    Each entry is either the index of a row in the underlying data or an extra row (e.g. a group footer),
+    so sorting, filtering and grouping only rearrange indexes and never copy the rows themselves.
+    """
+
+    def __init__(self, data: Sequence[list[Any]], entries: list[int | list[Any]]):
+        """
+        :param data: The underlying rows
+        :param entries: The index of a row in data, or an extra row, for each row of the view
+        """
+        self._data = data
+        self._entries = entries
+
+    def __getitem__(self, index: int) -> list[Any]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._entries)))]
+        entry = self._entries[index]
+        return self._data[entry] if isinstance(entry, int) else entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_positions(self) -> dict[int, int]:
+        """Returns the position in the view of each row of the underlying data that is in the view"""
+        return {entry: position for position, entry in enumerate(self._entries) if isinstance(entry, int)}
+
+    @property
+    def row_indexes(self) -> list[int]:
+        """The indexes of the rows of the underlying data in the view, in order, without the extra rows"""
+        return [entry for entry in self._entries if isinstance(entry, int)]
@@ -0,0 +1,128 @@
+import os
+import sys
+from threading import Lock
+from typing import Any
+
+from mizue.printer import Printer
+from mizue.util import LineRedraw, Utility
+from mizue.util.stoppable_thread import StoppableThread
+from .column_settings import ColumnSettings
+from .columnar_data import ColumnarData
+from .grid import Grid
+from .render_plan import RenderPlan
+
+
+class LiveGrid(Grid):
+    """
+    A grid that stays on the screen and redraws only the rows that have changed.
+
+    The whole grid is printed once by start. Afterward, update_row and update_cell mark rows as changed,
+    and a render thread rewrites only the terminal lines of those rows, moving the cursor to them.
+    Updates are coalesced: a row that changes several times between two frames is redrawn once.
+    The column widths are fixed when the grid is started, long cells are truncated even if the grid wraps them,
+    and the grid should fit in the terminal, because the lines that have scrolled out of the screen cannot be reached
+    by the cursor anymore.
+    If the output is not a terminal, the grid is printed once, when it is stopped.
+    """
+
+    def __init__(self, columns: list[ColumnSettings], data: list[list[Any]] | Any):
+        """
+        :param columns: The settings of the columns
+        :param data: A list of rows, which are updated in place. Column-oriented data is copied into a list of rows,
+            so its updates are not written back to it.
+        """
+        super().__init__(columns, data)
+        self._changed_rows: set[int] = set()
+        self._frame: list[str] = []
+        self._is_terminal = False
+        self._lock = Lock()
+        self._plan: RenderPlan | None = None
+        self._positions: dict[int, int] | None = None
+        self._thread: StoppableThread | None = None
+
+        self.frame_rate = 10
+        """The maximum number of frames drawn per second"""
+
+    @Grid.data.setter
+    def data(self, value: list[list[Any]] | Any) -> None:
+        Grid.data.fset(self, value)
+        if isinstance(self._data, ColumnarData):  # Its rows are assembled on access, and cannot be updated
+            self._data = list(self._data)
+
+    def start(self) -> None:
+        """Print the grid and start redrawing its changed rows"""
+        self._is_terminal = sys.stdout.isatty()
+        with self._lock:
+            self._plan = self._compile_render_plan()
+            self._plan.wraps = [False] * len(self.columns)  # Every row takes exactly one line
+            self._plan.has_wrapping = False
+            self._positions = None if self._rows is None else self._rows.get_positions()
+            self._frame = list(self._iter_lines(self.rows, self._plan))
+            self._changed_rows.clear()
+        if self._is_terminal:
+            Printer.write(os.linesep.join(self._frame) + os.linesep)
+            self._thread = StoppableThread(target=self._run, args=())
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop redrawing the grid, after drawing the pending changes"""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.join()
+            self._thread = None
+        if self._is_terminal:
+            self._draw_changes()
+        else:
+            with self._lock:
+                self._frame = list(self._iter_lines(self.rows))
+            Printer.write(os.linesep.join(self._frame) + "\n")
+
+    def update_cell(self, row: int, column: int | str, value: Any) -> None:
+        """
+        Update a cell of the grid
+        :param row: The index of the row in the data
+        :param column: The index or the title of the column
+        :param value: The new value of the cell
+        """
+        index = self._get_column_index(column)
+        with self._lock:
+            self.data[row][index] = value
+            self._changed_rows.add(row)
+
+    def update_row(self, row: int, values: list[Any]) -> None:
+        """
+        Replace a row of the grid
+        :param row: The index of the row in the data
+        :param values: The new values of the row
+        """
+        with self._lock:
+            self.data[row] = values
+            self._changed_rows.add(row)
+
+    def _draw_changes(self) -> None:
+        with self._lock:
+            if len(self._changed_rows) == 0:
+                return
+            changed_rows, self._changed_rows = self._changed_rows, set()
+            changes: list[tuple[int, str]] = []
+            for row in changed_rows:
+                position = row if self._positions is None else self._positions.get(row)
+                if position is None:  # Filtered out
+                    continue
+                line_number = position + 3  # After the top border, the header and the separator
+                line = self._create_row(self.data[row], False, self._plan)
+                if line != self._frame[line_number]:
+                    self._frame[line_number] = line
+                    changes.append((line_number, line))
+
+        if len(changes) > 0:
+            Printer.write(self._get_redraw_sequence(sorted(changes)))
+
+    def _get_redraw_sequence(self, changes: list[tuple[int, str]]) -> str:
+        # The lines that have scrolled out of the screen cannot be reached by the cursor anymore
+        first_visible_line = len(self._frame) - Utility.get_terminal_height() + 1
+        return LineRedraw.get_sequence(changes, len(self._frame), first_visible_line)
+
+    def _run(self) -> None:
+        while not self._thread.wait(1 / self.frame_rate):
+            self._draw_changes()
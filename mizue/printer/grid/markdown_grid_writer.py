@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING, TextIO
+
+from .alignment import Alignment
+from .grid_writer import GridWriter
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+
+class MarkdownGridWriter(GridWriter):
+    """Writes a grid as a Markdown table, keeping the alignment of the columns"""
+
+    _DELIMITERS = {Alignment.LEFT: ":---", Alignment.CENTER: ":---:", Alignment.RIGHT: "---:"}
+
+    def write(self, grid: "Grid", file: TextIO, colors: bool) -> None:
+        file.write(MarkdownGridWriter._format_row([column.title for column in grid.columns]))
+        file.write(MarkdownGridWriter._format_row([MarkdownGridWriter._DELIMITERS[column.alignment]
+                                                   for column in grid.columns], escape=False))
+        for cells in grid._iter_plain_rows():
+            file.write(MarkdownGridWriter._format_row(cells))
+
+    @staticmethod
+    def _format_row(cells: list[str], escape: bool = True) -> str:
+        if escape:
+            cells = [cell.replace("|", "\\|").replace("\n", "<br>") for cell in cells]
+        return "| " + " | ".join(cells) + " |\n"
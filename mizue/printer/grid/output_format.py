@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class OutputFormat(Enum):
+    TEXT = 1,
+    CSV = 2,
+    MARKDOWN = 3,
+    HTML = 4
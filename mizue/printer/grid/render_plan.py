@@ -0,0 +1,92 @@
+from math import ceil, floor
+from typing import Any, Callable
+
+from .alignment import Alignment
+from .cell_renderer_args import CellRendererArgs
+from .column import Column
+from .column_renderer_args import ColumnRendererArgs
+
+
+class RenderPlan:
+    """
+    The precompiled layout of a grid, built once per print and reused for every row.
+
+    Everything that does not depend on the content of a cell is resolved up front: the border lines,
+    the colored vertical border, the renderer of each column and the padding of each possible cell width.
+    """
+
+    def __init__(self, columns: list[Column], renderers: list[Callable[[CellRendererArgs], str] | None],
+                 vertical_border: str, top_border: str, middle_border: str, bottom_border: str,
+                 wraps: list[bool] | None = None):
+        """
+        :param columns: The columns of the grid, already sized
+        :param renderers: The cell renderer of each column
+        :param vertical_border: The vertical border, already colored
+        :param top_border: The top border line, already colored
+        :param middle_border: The border line between the header and the rows, already colored
+        :param bottom_border: The bottom border line, already colored
+        :param wraps: Whether the cells of each column are wrapped instead of truncated
+        """
+        self.args = [CellRendererArgs(cell="", index=column.index, is_header=False, width=column.width)
+                     for column in columns]
+        """The renderer arguments of each column, reused for every cell of the column"""
+
+        self.batch_renderers = [column.batch_renderer for column in columns]
+        self.has_batch_renderers = any(self.batch_renderers)
+        self.bottom_border = bottom_border
+        self.middle_border = middle_border
+
+        self.paddings = [RenderPlan._get_paddings(column) for column in columns]
+        """
+        The left and right padding of each column, including the space next to the border,
+        indexed by the display width of the cell
+        """
+
+        self.renderers = renderers
+
+        self.top_border = top_border
+        self.vertical_border = vertical_border
+        self.widths = [column.width for column in columns]
+        self.wraps = [False] * len(columns) if wraps is None else wraps
+        self.has_wrapping = any(self.wraps)
+
+    def render_cells(self, rows: list[list[Any]], is_header: bool = False) -> list[list[str]]:
+        """
+        Render the cells of a chunk of rows, column by column.
+        A column with a batch renderer gets all its cells of the chunk at once.
+        This method does not use the shared renderer arguments, so chunks can be rendered in parallel.
+        :param rows: The rows to render
+        :param is_header: Whether the rows are the header
+        :return: The rendered cells of each row
+        """
+        rendered_columns = []
+        for index, width in enumerate(self.widths):
+            cells = [str(row[index]) for row in rows]
+            batch_renderer = self.batch_renderers[index]
+            renderer = self.renderers[index]
+            if batch_renderer is not None:
+                rendered_columns.append(batch_renderer(ColumnRendererArgs(cells=cells, index=index,
+                                                                          is_header=is_header, width=width)))
+            elif renderer is not None:
+                args = CellRendererArgs(cell="", index=index, is_header=is_header, width=width)
+                rendered_cells = []
+                for cell in cells:
+                    args.cell = cell
+                    rendered_cells.append(renderer(args))
+                rendered_columns.append(rendered_cells)
+            else:
+                rendered_columns.append(cells)
+        return [list(row) for row in zip(*rendered_columns)]
+
+    @staticmethod
+    def _get_paddings(column: Column) -> list[tuple[str, str]]:
+        paddings = []
+        for cell_width in range(column.width + 1):
+            space = column.width - cell_width
+            if column.alignment == Alignment.RIGHT:
+                paddings.append((" " * (space + 1), " "))
+            elif column.alignment == Alignment.CENTER:
+                paddings.append((" " * (int(floor(space / 2)) + 1), " " * (int(ceil(space / 2)) + 1)))
+            else:
+                paddings.append((" ", " " * (space + 1)))
+        return paddings
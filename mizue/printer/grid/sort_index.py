@@ -0,0 +1,61 @@
+from collections.abc import Sequence
+from typing import Any
+
+
+class SortIndex:
+    """
+    The sorted order of the values of a grid column, built once and reused by every sort on the column.
+
+    Sorting all the rows (or most of them) by the column is then a linear pass over the stored order,
+    and sorting a few rows compares integer ranks instead of the values.
+    """
+
+    def __init__(self, values: Sequence[Any]):
+        """
+        :param values: The values of the column, one for each row of the data
+        """
+        self.order = sorted(range(len(values)), key=values.__getitem__)
+        """The indexes of the rows in ascending order of their values, equal values in the order of the data"""
+
+        self.ranks = [0] * len(values)
+        """The rank of each row: the position of its value in the sorted order, equal values sharing a rank"""
+
+        self._descending_order: list[int] | None = None
+
+        rank = 0
+        for position, row_index in enumerate(self.order):
+            if position > 0 and values[row_index] != values[self.order[position - 1]]:
+                rank = position
+            self.ranks[row_index] = rank
+
+    def sort(self, row_indexes: list[int], descending: bool = False) -> list[int]:
+        """
+        Sort rows by the column, keeping the rows with equal values in the order they are given
+        :param row_indexes: The indexes of the rows to sort, in the order of the data
+        :param descending: Whether to sort in descending order
+        :return: The sorted row indexes
+        """
+        if len(row_indexes) < len(self.order) // 8:
+            return sorted(row_indexes, key=self.ranks.__getitem__, reverse=descending)
+
+        if len(row_indexes) == len(self.order):
+            if not descending:
+                return list(self.order)
+            if self._descending_order is None:
+                self._descending_order = self._reverse_runs(self.order)
+            return list(self._descending_order)
+
+        selected = set(row_indexes)
+        order = [row_index for row_index in self.order if row_index in selected]
+        return self._reverse_runs(order) if descending else order
+
+    def _reverse_runs(self, order: list[int]) -> list[int]:
+        # Reverse the order of the values, but not the order of the rows that share a value
+        ranks = self.ranks
+        runs = []
+        start = 0
+        for position in range(1, len(order) + 1):
+            if position == len(order) or ranks[order[position]] != ranks[order[start]]:
+                runs.append(order[start:position])
+                start = position
+        return [row_index for run in reversed(runs) for row_index in run]
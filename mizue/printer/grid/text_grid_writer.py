@@ -0,0 +1,25 @@
+import itertools
+from typing import TYPE_CHECKING, TextIO
+
+from .grid_writer import GridWriter
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+
+class TextGridWriter(GridWriter):
+    """Writes a grid as the bordered table printed in the terminal, with or without colors"""
+
+    def __init__(self, batch_size: int = 1000):
+        """
+        :param batch_size: The number of lines written at once
+        """
+        self.batch_size = batch_size
+
+    def write(self, grid: "Grid", file: TextIO, colors: bool) -> None:
+        lines = grid._iter_lines(grid.rows, grid._compile_render_plan(colors))
+        while True:
+            batch = list(itertools.islice(lines, self.batch_size))
+            if len(batch) == 0:
+                break
+            file.write("\n".join(batch) + "\n")
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+
+
+class OutputSink(ABC):
+    """
+    The destination of the text written by Printer, Progress and Grid.
+
+    A sink decides when the text reaches the terminal: StreamSink writes it immediately,
+    and BufferedSink collects it and writes it in batches.
+    """
+
+    def close(self) -> None:
+        """Write the pending text and release the resources of the sink"""
+        self.flush()
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Write the pending text, returning when it has been written"""
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """Write a text"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
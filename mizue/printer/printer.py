@@ -1,42 +1,67 @@
-import typing
-import re
-
+from contextlib import contextmanager
+from typing import Iterator
+
+from .ansi_text import AnsiText
+from .buffered_sink import BufferedSink
+from .color_mode import ColorMode
+from .output_sink import OutputSink
+from .stream_sink import StreamSink
+from .style import Style
+from .terminal import Terminal
 from .terminal_colors import TerminalColors
 
+_NO_COLORS = ColorMode.NONE
+
 
 class Printer:
     _newline: bool = True
 
+    sink: OutputSink = StreamSink()
+    """Where Printer, Progress and Grid write their output. Use set_sink or buffered to change it."""
+
+    @staticmethod
+    @contextmanager
+    def buffered(max_size: int = 65536, flush_interval: float = 0.05) -> Iterator[BufferedSink]:
+        """
+        Batch the output of Printer, Progress and Grid inside a with block, and write what is pending on exit.
+        :param max_size: The number of pending characters that triggers a write
+        :param flush_interval: The maximum time, in seconds, that a text waits before it is written
+        """
+        sink = BufferedSink(max_size=max_size, flush_interval=flush_interval)
+        previous_sink = Printer.sink
+        Printer.sink = sink
+        try:
+            yield sink
+        finally:
+            Printer.sink = previous_sink
+            sink.close()
+
     @staticmethod
     def format_hex(text: str, text_hex: str, bg_hex: str | None = None,
                    bold: bool = False, underlined: bool = False) -> str:
         """Formats a string with the specified color, boldness, and underlining."""
-        if bg_hex is None:
-            text_rgb: tuple = Printer.hex_to_rgb(text_hex)
-            return Printer.format_rgb(text, text_rgb, None, bold, underlined)
-        else:
-            text_rgb: tuple = Printer.hex_to_rgb(text_hex)
-            bg_rgb: tuple = Printer.hex_to_rgb(bg_hex)
-            return Printer.format_rgb(text, text_rgb, bg_rgb, bold, underlined)
+        if Terminal.color_mode is _NO_COLORS:
+            return text
+        return Style.get(text_hex, bg_hex, bold, underlined).format(text)
 
     @staticmethod
     def format_rgb(text: str, text_rgb: tuple[int, int, int], bg_rgb: tuple[int, int, int] | None = None,
                    bold: bool = False, underlined: bool = False) -> str:
         """Formats a string with the specified color, boldness, and underlining."""
-        bolded = TerminalColors.BOLD if bold else ''
-        underlined = TerminalColors.UNDERLINE if underlined else ''
-        end = TerminalColors.END_CHAR
-        if bg_rgb is None:
-            return f'\033[38;2;{text_rgb[0]};{text_rgb[1]};{text_rgb[2]}m{bolded}{underlined}{text}{end}'
-        else:
-            return f'\033[38;2;{text_rgb[0]};{text_rgb[1]};{text_rgb[2]}m' \
-                   f'\033[48;2;{bg_rgb[0]};{bg_rgb[1]};{bg_rgb[2]}m{bolded}{underlined}{text}{end}'
+        if Terminal.color_mode is _NO_COLORS:
+            return text
+        return Style.get(tuple(text_rgb), tuple(bg_rgb) if bg_rgb is not None else None, bold, underlined).format(text)
 
     @staticmethod
     def error(text: str, bold: bool = False, underlined: bool = False) -> None:
         """Prints an error message to the console."""
         Printer.print_hex(text, TerminalColors.ERROR, bold=bold, underlined=underlined)
 
+    @staticmethod
+    def flush() -> None:
+        """Writes the pending output of the sink."""
+        Printer.sink.flush()
+
     @staticmethod
     def get_color_string(color: str | tuple[int, int, int]):
         if isinstance(color, tuple):
@@ -47,8 +72,7 @@ class Printer:
     @staticmethod
     def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
         """Converts a hex string to an RGB tuple."""
-        hex_without_hash = hex_color.replace('#', '') if hex_color.startswith('#') else hex_color
-        return typing.cast(tuple[int, int, int], tuple(int(hex_without_hash[i:i + 2], 16) for i in (0, 2, 4)))
+        return Style.to_rgb(hex_color)
 
     @staticmethod
     def info(text: str, bold: bool = False, underlined: bool = False) -> None:
@@ -62,15 +86,15 @@ class Printer:
             return
         Printer._newline = not prevent
         if Printer._newline:
-            print()
+            Printer.write('\n')
 
     @staticmethod
     def print_hex(text: str, text_hex: str, bg_hex: str | None = None,
                   bold: bool = False, underlined: bool = False) -> None:
         """Prints a message to the console."""
-        rgb: tuple = Printer.hex_to_rgb(text_hex)
-        bg_rgb: tuple = Printer.hex_to_rgb(bg_hex) if bg_hex is not None else None
-        Printer.print_rgb(text, rgb, bg_rgb, bold, underlined)
+        formatted_text = text if Printer._formatted(text) else Printer.format_hex(text, text_hex, bg_hex, bold,
+                                                                                  underlined)
+        Printer.write(f"{formatted_text}\n" if Printer._newline else formatted_text)
 
     @staticmethod
     def print_rgb(text: str, text_rgb: tuple[int, int, int], bg_rgb: tuple[int, int, int] | None = None,
@@ -78,13 +102,18 @@ class Printer:
         """Prints a message to the console."""
         formatted_text = text if Printer._formatted(text) else Printer.format_rgb(text, text_rgb, bg_rgb, bold,
                                                                                   underlined)
-        print(formatted_text, end='\n' if Printer._newline else '', flush=True)
+        Printer.write(f"{formatted_text}\n" if Printer._newline else formatted_text)
 
     @staticmethod
     def rgb_to_hex(rgb: tuple[int, int, int]) -> str:
         """Converts an RGB tuple to a hex string."""
         return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
 
+    @staticmethod
+    def set_sink(sink: OutputSink | None) -> None:
+        """Sets where the output is written, or writes it directly to the standard output if sink is None."""
+        Printer.sink = StreamSink() if sink is None else sink
+
     @staticmethod
     def short_hex_to_long_hex(hex_color: str) -> str:
         """Converts a short hex color to a long hex color."""
@@ -100,18 +129,23 @@ class Printer:
     @staticmethod
     def strip_ansi(text: str) -> str:
         """Strips ANSI escape sequences from a string."""
-        return re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', text)
+        return AnsiText.strip(text)
 
     @staticmethod
     def strip_colors(text: str) -> str:
-        stripped_text = re.sub(r'\x1b[\[\d;]+m', '', text)
-        return Printer.strip_ansi(stripped_text)
+        """Strips color codes, and any other ANSI escape sequence, from a string."""
+        return AnsiText.strip(text)
 
     @staticmethod
     def warning(text: str, bold: bool = False, underlined: bool = False) -> None:
         """Prints a warning message to the console."""
         Printer.print_hex(text, TerminalColors.WARNING, bold=bold, underlined=underlined)
 
+    @staticmethod
+    def write(text: str) -> None:
+        """Writes a text to the sink as it is."""
+        Printer.sink.write(text)
+
     @staticmethod
     def _formatted(text: str) -> bool:
         return str(text).endswith(TerminalColors.END_CHAR)
@@ -0,0 +1,22 @@
+import sys
+from typing import TextIO
+
+from .output_sink import OutputSink
+
+
+class StreamSink(OutputSink):
+    """Writes the text to a stream as soon as it is written, flushing the stream every time"""
+
+    def __init__(self, stream: TextIO | None = None):
+        """
+        :param stream: The stream to write to. Defaults to the standard output at the time of each write.
+        """
+        self._stream = stream
+
+    def flush(self) -> None:
+        (self._stream or sys.stdout).flush()
+
+    def write(self, text: str) -> None:
+        stream = self._stream or sys.stdout
+        stream.write(text)
+        stream.flush()
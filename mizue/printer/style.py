@@ -0,0 +1,126 @@
+import typing
+from functools import lru_cache
+
+from .color_mode import ColorMode
+from .terminal import Terminal
+from .terminal_colors import TerminalColors
+
+Color = str | tuple[int, int, int]
+
+_NO_COLORS = ColorMode.NONE  # Enum members are slow to look up on their class
+
+_CUBE_LEVELS = [0, 95, 135, 175, 215, 255]
+_CUBE_INDEXES = [0 if value < 48 else 1 if value < 115 else (value - 35) // 40 for value in range(256)]
+"""The index of the nearest level of the 256-color cube, for each value of an RGB component"""
+
+_BASIC_COLORS = [
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255),
+    (255, 255, 255),
+]
+
+
+class Style:
+    """
+    A compiled text style.
+
+    The escape codes that start the style are built once for each color mode, so formatting a text
+    is a single concatenation, and nothing at all when colors are disabled (see Terminal).
+    Colors are downgraded to the nearest color of the 256-color or 16-color palettes when the terminal needs it.
+    Use Style.get to reuse the styles of the colors that are used repeatedly instead of creating new ones.
+    """
+
+    def __init__(self, color: Color, background: Color | None = None, bold: bool = False, underlined: bool = False):
+        """
+        :param color: The text color, as a hex string or an RGB tuple
+        :param background: The background color, as a hex string or an RGB tuple
+        :param bold: Whether the text is bold
+        :param underlined: Whether the text is underlined
+        """
+        self._background = Style.to_rgb(background) if background is not None else None
+        self._bold = bold
+        self._color = Style.to_rgb(color)
+        self._compiled: tuple[ColorMode | None, str] = (None, "")
+        """The color mode that the style was last used in, and its prefix in that mode"""
+
+        self._prefixes: dict[ColorMode, str] = {ColorMode.NONE: ""}
+        self._underlined = underlined
+
+    @property
+    def prefix(self) -> str:
+        """The escape codes that start the style in the current color mode"""
+        mode = Terminal.color_mode
+        compiled = self._compiled
+        return compiled[1] if compiled[0] is mode else self._compile(mode)
+
+    def format(self, text: str) -> str:
+        """Formats a text with the style"""
+        mode = Terminal.color_mode
+        if mode is _NO_COLORS:
+            return text
+        compiled = self._compiled
+        if compiled[0] is not mode:
+            self._compile(mode)
+            compiled = self._compiled
+        return f"{compiled[1]}{text}{TerminalColors.END_CHAR}"
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get(color: Color, background: Color | None = None, bold: bool = False, underlined: bool = False) -> "Style":
+        """Returns the style of the given colors, compiling it only the first time it is requested"""
+        return Style(color, background, bold, underlined)
+
+    @staticmethod
+    def to_rgb(color: Color) -> tuple[int, int, int]:
+        """Converts a hex string to an RGB tuple, and returns RGB tuples as they are"""
+        if not isinstance(color, str):
+            return typing.cast(tuple[int, int, int], tuple(color))
+        hex_without_hash = color.replace('#', '') if color.startswith('#') else color
+        return typing.cast(tuple[int, int, int], tuple(int(hex_without_hash[i:i + 2], 16) for i in (0, 2, 4)))
+
+    def _compile(self, mode: ColorMode) -> str:
+        # The prefix of every mode is built once, and the prefix of the current mode is kept at hand
+        prefix = self._prefixes.get(mode)
+        if prefix is None:
+            prefix = Style._get_color_code(self._color, mode, False)
+            if self._background is not None:
+                prefix += Style._get_color_code(self._background, mode, True)
+            if self._bold:
+                prefix += TerminalColors.BOLD
+            if self._underlined:
+                prefix += TerminalColors.UNDERLINE
+            self._prefixes[mode] = prefix
+        if mode is not ColorMode.NONE:
+            self._compiled = (mode, prefix)
+        return prefix
+
+    @staticmethod
+    def _get_color_code(rgb: tuple[int, int, int], mode: ColorMode, background: bool) -> str:
+        red, green, blue = rgb
+        if mode is ColorMode.TRUECOLOR:
+            return f"\033[{48 if background else 38};2;{red};{green};{blue}m"
+        if mode is ColorMode.COLORS_256:
+            return f"\033[{48 if background else 38};5;{Style._to_256_colors(rgb)}m"
+        index = Style._to_16_colors(rgb)
+        if index < 8:
+            return f"\033[{(40 if background else 30) + index}m"
+        return f"\033[{(100 if background else 90) + index - 8}m"
+
+    @staticmethod
+    def _get_distance(first: tuple[int, int, int], second: tuple[int, int, int]) -> int:
+        return sum((a - b) * (a - b) for a, b in zip(first, second))
+
+    @staticmethod
+    def _to_16_colors(rgb: tuple[int, int, int]) -> int:
+        return min(range(len(_BASIC_COLORS)), key=lambda index: Style._get_distance(rgb, _BASIC_COLORS[index]))
+
+    @staticmethod
+    def _to_256_colors(rgb: tuple[int, int, int]) -> int:
+        # The nearest color of the 6x6x6 cube or of the 24 shades of gray, whichever is closer
+        red, green, blue = (_CUBE_INDEXES[value] for value in rgb)
+        cube = (_CUBE_LEVELS[red], _CUBE_LEVELS[green], _CUBE_LEVELS[blue])
+        gray_index = min(23, max(0, (sum(rgb) // 3 - 8) // 10))
+        gray_value = 8 + gray_index * 10
+        if Style._get_distance(rgb, (gray_value,) * 3) < Style._get_distance(rgb, cube):
+            return 232 + gray_index
+        return 16 + 36 * red + 6 * green + blue
@@ -0,0 +1,14 @@
+from typing import NamedTuple
+
+
+class StyledSpan(NamedTuple):
+    """A run of text printed with the same escape codes"""
+
+    style: str
+    """The color codes that are active for the text, joined, or an empty string if the text is not styled"""
+
+    text: str
+    """The text without escape codes"""
+
+    width: int
+    """The display width of the text"""
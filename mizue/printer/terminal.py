@@ -0,0 +1,55 @@
+import os
+import sys
+from typing import TextIO
+
+from .color_mode import ColorMode
+
+
+class Terminal:
+    """
+    The color capabilities of the terminal.
+
+    The color mode is detected once, when the package is imported, and is used by Printer, Style and Grid
+    to downgrade colors to what the terminal supports, or to skip generating them at all.
+    """
+
+    color_mode: ColorMode = ColorMode.TRUECOLOR
+    """The color mode used to format text. Use set_color_mode to change it."""
+
+    @staticmethod
+    def detect_color_mode(stream: TextIO | None = None) -> ColorMode:
+        """
+        Detect the color mode supported by a stream from the environment:
+        NO_COLOR disables colors, as does a stream that is not a terminal or TERM=dumb.
+        COLORTERM=truecolor (or 24bit) enables 24-bit colors, a TERM that contains "256color" enables 256 colors,
+        and other terminals get the 16 basic colors. Windows consoles support 24-bit colors.
+        :param stream: The stream to detect the color mode of. Defaults to the standard output.
+        :return: The color mode
+        """
+        stream = sys.stdout if stream is None else stream
+        if os.environ.get("NO_COLOR"):
+            return ColorMode.NONE
+        if stream is None or not hasattr(stream, "isatty") or not stream.isatty():
+            return ColorMode.NONE
+
+        term = os.environ.get("TERM", "").lower()
+        if term == "dumb":
+            return ColorMode.NONE
+        if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+            return ColorMode.TRUECOLOR
+        if "256color" in term:
+            return ColorMode.COLORS_256
+        if os.name == "nt" and term == "":
+            return ColorMode.TRUECOLOR
+        return ColorMode.COLORS_16
+
+    @staticmethod
+    def set_color_mode(mode: ColorMode | None = None) -> None:
+        """
+        Set the color mode used to format text
+        :param mode: The color mode, or None to detect it again
+        """
+        Terminal.color_mode = Terminal.detect_color_mode() if mode is None else mode
+
+
+Terminal.color_mode = Terminal.detect_color_mode()
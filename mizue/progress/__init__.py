@@ -1,8 +1,10 @@
 from .progress_renderer_args import ProgressBarRendererArgs, LabelRendererArgs, SpinnerRendererArgs, \
-    PercentageRendererArgs, InfoSeparatorRendererArgs, InfoTextRendererArgs
+    PercentageRendererArgs, InfoSeparatorRendererArgs, InfoTextRendererArgs, RateRendererArgs
 from .progress import Progress
 from .colorful_progress import ColorfulProgress
+from .multi_progress import MultiProgress
 from .spinner import Spinner
 
 __all__ = ['ProgressBarRendererArgs', 'PercentageRendererArgs', 'InfoSeparatorRendererArgs', 'InfoTextRendererArgs',
-           'LabelRendererArgs', 'SpinnerRendererArgs', 'Progress', 'ColorfulProgress', 'Spinner']
+           'LabelRendererArgs', 'RateRendererArgs', 'SpinnerRendererArgs', 'Progress', 'ColorfulProgress', 'MultiProgress',
+           'Spinner']
@@ -1,7 +1,18 @@
 from .progress_renderer_args import LabelRendererArgs, PercentageRendererArgs, ProgressBarRendererArgs, \
-    SpinnerRendererArgs
+    RateRendererArgs, SpinnerRendererArgs
 from .progress import Progress
-from ..printer import Printer
+from ..printer import Style
+
+_COMPLETE_STYLE = Style.get('#0EB33B')
+_LABEL_STYLE = Style.get('#FFCC75')
+_PERCENTAGE_STYLES = [
+    (15, Style.get('#FF0D0D')),
+    (30, Style.get('#FF4E11')),
+    (45, Style.get('#FF8E15')),
+    (60, Style.get('#FAB733')),
+    (75, Style.get('#ACB334')),
+    (90, Style.get('#69B34C')),
+]
 
 
 class ColorfulProgress(Progress):
@@ -11,26 +22,16 @@ class ColorfulProgress(Progress):
 
     @staticmethod
     def get_basic_colored_text(text: str, percentage: float):
-        if percentage < 15:
-            return Printer.format_hex(text, '#FF0D0D')
-        elif percentage < 30:
-            return Printer.format_hex(text, '#FF4E11')
-        elif percentage < 45:
-            return Printer.format_hex(text, '#FF8E15')
-        elif percentage < 60:
-            return Printer.format_hex(text, '#FAB733')
-        elif percentage < 75:
-            return Printer.format_hex(text, '#ACB334')
-        elif percentage < 90:
-            return Printer.format_hex(text, '#69B34C')
-        else:
-            return Printer.format_hex(text, '#0EB33B')
+        for limit, style in _PERCENTAGE_STYLES:
+            if percentage < limit:
+                return style.format(text)
+        return _COMPLETE_STYLE.format(text)
 
     @staticmethod
     def _label_renderer(args: LabelRendererArgs):
         if args.percentage < 100:
-            return Printer.format_hex(args.label, '#FFCC75')
-        return Printer.format_hex(args.label, '#0EB33B')
+            return _LABEL_STYLE.format(args.label)
+        return _COMPLETE_STYLE.format(args.label)
 
     @staticmethod
     def _percentage_renderer(args: PercentageRendererArgs):
@@ -40,6 +41,14 @@ class ColorfulProgress(Progress):
     def _progress_renderer(args: ProgressBarRendererArgs):
         return ColorfulProgress.get_basic_colored_text(args.text, args.percentage)
 
+    @staticmethod
+    def _rate_renderer(args: RateRendererArgs):
+        if args.percentage < 100:
+            text = " {:.2f}/s ETA {}".format(args.rate, Progress.format_duration(args.eta))
+        else:
+            text = " in {}".format(Progress.format_duration(args.elapsed))
+        return ColorfulProgress.get_basic_colored_text(text, args.percentage)
+
     @staticmethod
     def _spinner_renderer(args: SpinnerRendererArgs):
         return ColorfulProgress.get_basic_colored_text(args.spinner, args.percentage)
@@ -49,5 +58,6 @@ class ColorfulProgress(Progress):
         self.percentage_renderer = lambda args: self._percentage_renderer(args)  # PercentageRendererArgs
         self.progress_bar_renderer = lambda args: self._progress_renderer(args)  # ProgressBarRendererArgs
         self.spinner_renderer = lambda args: self._spinner_renderer(args)  # SpinnerRendererArgs
+        self.rate_renderer = lambda args: self._rate_renderer(args)  # RateRendererArgs
         self.info_text_renderer = lambda args: self._info_text_renderer(args.text)  # InfoTextRendererArgs
         self.info_separator_renderer = lambda args: self._info_separator_renderer()  # InfoSeparatorRendererArgs
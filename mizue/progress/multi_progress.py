@@ -0,0 +1,96 @@
+from threading import Lock
+
+from mizue.printer import AnsiText, Printer
+from mizue.util import LineRedraw, Utility
+from mizue.util.stoppable_thread import StoppableThread
+from .progress import Progress
+
+
+class MultiProgress:
+    """
+    Displays several progress bars stacked on consecutive lines of the terminal.
+
+    A single render thread draws every bar, so the bars do not need their own threads and must not be started.
+    Each frame is written at once, and only the lines of the bars whose text has changed are rewritten,
+    so the amount of output depends on the number of bars that are moving, not on the number of bars.
+    The spinner of a complete bar stands still, so complete bars are not redrawn at all.
+    The bars should fit in the terminal, because the lines that have scrolled out of the screen cannot be reached
+    by the cursor anymore.
+    """
+
+    def __init__(self):
+        self._bars: list[Progress] = []
+        self._frame: list[str] = []
+        self._interval = 0.1
+        self._lock = Lock()
+        self._thread: StoppableThread | None = None
+
+    def add(self, progress: Progress) -> Progress:
+        """
+        Add a progress bar below the others
+        :param progress: A progress bar that is not started
+        :return: The progress bar
+        """
+        with self._lock:
+            self._bars.append(progress)
+        return progress
+
+    def remove(self, progress: Progress) -> None:
+        """Remove a progress bar, moving the bars below it up"""
+        with self._lock:
+            self._bars.remove(progress)
+
+    def set_update_interval(self, interval: float) -> None:
+        """Set the time between two frames, in seconds"""
+        self._interval = interval
+
+    def start(self) -> None:
+        """Start drawing the progress bars"""
+        Utility.hide_cursor()
+        Utility.get_terminal_size()  # Cache the size while on the main thread, which is notified of resizes
+        self._frame = []
+        self._thread = StoppableThread(target=self._run, args=())
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop drawing the progress bars, after drawing their last state"""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.join()
+            self._thread = None
+        self._draw()
+        Printer.flush()
+        Utility.show_cursor()
+
+    def _draw(self) -> None:
+        with self._lock:
+            max_width = Utility.get_terminal_width() - 1  # A full line would move the cursor to the next one
+            frame = [AnsiText.truncate(bar._get_next_frame(), max_width) for bar in self._bars]
+        previous_frame, self._frame = self._frame, frame
+        if len(frame) != len(previous_frame):
+            sequence = self._get_full_redraw_sequence(previous_frame, frame)
+        else:
+            sequence = self._get_redraw_sequence(previous_frame, frame)
+        if len(sequence) > 0:
+            Printer.write(sequence)
+
+    @staticmethod
+    def _get_full_redraw_sequence(previous_frame: list[str], frame: list[str]) -> str:
+        # The cursor rests on the line below the bars. When bars are added or removed, every line is written again
+        # from the first one, and the lines left over from a higher frame are cleared.
+        parts = [f"\x1b[{len(previous_frame)}F"] if len(previous_frame) > 0 else []
+        parts.extend(f"\r{line}\x1b[K\n" for line in frame)
+        parts.append("\x1b[J")
+        return "".join(parts)
+
+    @staticmethod
+    def _get_redraw_sequence(previous_frame: list[str], frame: list[str]) -> str:
+        changes = [(line_number, line) for line_number, (line, previous_line) in enumerate(zip(frame, previous_frame))
+                   if line != previous_line]
+        return LineRedraw.get_sequence(changes, len(frame))
+
+    def _run(self) -> None:
+        while True:
+            self._draw()
+            if self._thread.wait(self._interval):
+                break
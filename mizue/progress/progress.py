@@ -1,18 +1,30 @@
-import sys
-from time import sleep
+import math
+from collections import deque
+from threading import Lock
+from time import monotonic
 
-from mizue.printer import Printer
+from mizue.printer import AnsiText, DisplayWidth, Printer
 from mizue.util import Utility
 from mizue.util.stoppable_thread import StoppableThread
 from .progress_renderer_args import ProgressBarRendererArgs, SpinnerRendererArgs, LabelRendererArgs, \
-    InfoSeparatorRendererArgs, InfoTextRendererArgs, PercentageRendererArgs
+    InfoSeparatorRendererArgs, InfoTextRendererArgs, PercentageRendererArgs, RateRendererArgs
 
 
 class Progress:
     def __init__(self, start: int = 0, end: int = 100, value: int = 0):
-        self._active = False
         self._end = end
+        self._finished_at: float | None = None
+        self._frame = ""
+        self._history: deque[tuple[float, int]] = deque(maxlen=32)
+        """The last values and when they were reached, to measure the rate over a sliding window"""
+
         self._interval = 0.1
+        self._rate = 0.0
+        self._rate_time = 0.0
+        """The time over which the rate has been averaged, to correct its bias towards its initial value of zero"""
+
+        self._rendered_key: tuple | None = None
+        self._rendered_parts = ("", "")
         self._spinner = [
             "▹▹▹▹▹",
             "▸▹▹▹▹",
@@ -24,22 +36,71 @@ class Progress:
         self._spinner_end_symbol = "⠿"
         self._spinner_index = 0
         self._start = start
+        self._started_at: float | None = None
+        self._state: tuple[int, str] = (value, "")
+        """The value and the info text, replaced together so that the render thread never sees them out of sync"""
+
+        self._state_lock = Lock()
         self._thread = None
-        self._value = value
         self._width = 10
 
         self.info_separator = " | "
         self.info_separator_renderer = lambda args: self._info_separator_renderer()  # InfoSeparatorRendererArgs
 
-        self.info_text = ""
-        """Set the info text to be displayed after the progress bar"""
-
         self.info_text_renderer = lambda args: self._info_text_renderer(args.text)  # InfoTextRendererArgs
         self.label = ""
         self.label_renderer = lambda args: args.label  # LabelRendererArgs
         self.percentage_renderer = lambda args: "{:.2f}%".format(args.percentage)  # PercentageRendererArgs
+
+        self.rate_renderer = lambda args: ""  # RateRendererArgs
+        """Renders the text displayed after the percentage, with the rate, the ETA and the elapsed time"""
+
+        self.rate_smoothing = 2.0
+        """The time, in seconds, over which the rate is averaged. The higher, the smoother the rate and the ETA."""
+
         self.spinner_renderer = lambda args: args.spinner  # SpinnerRendererArgs
-        self.progress_bar_renderer = lambda args: self._progress_bar_renderer()  # ProgressBarRendererArgs
+        self.progress_bar_renderer = lambda args: args.text  # ProgressBarRendererArgs
+
+    @property
+    def elapsed(self) -> float:
+        """The time, in seconds, since the progress bar was started, until it was completed"""
+        if self._started_at is None:
+            return 0.0
+        return (self._finished_at or monotonic()) - self._started_at
+
+    @property
+    def eta(self) -> float | None:
+        """The estimated time, in seconds, until the progress bar is complete, or None if it is not moving"""
+        value = self._state[0]
+        if value >= self._end:
+            return 0.0
+        rate = self.rate
+        return (self._end - value) / rate if rate > 0 else None
+
+    @staticmethod
+    def format_duration(seconds: float | None) -> str:
+        """Formats a duration as minutes and seconds, with hours if needed, or --:-- if it is unknown"""
+        if seconds is None:
+            return "--:--"
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02}:{seconds:02}" if hours > 0 else f"{minutes:02}:{seconds:02}"
+
+    @property
+    def info_text(self) -> str:
+        """The info text to be displayed after the progress bar"""
+        return self._state[1]
+
+    @info_text.setter
+    def info_text(self, info_text: str) -> None:
+        with self._state_lock:
+            self._state = (self._state[0], info_text)
+
+    @property
+    def rate(self) -> float:
+        """The progress per second, averaged exponentially over the last rate_smoothing seconds"""
+        rate, rate_time = self._rate, self._rate_time
+        return rate / (1 - math.exp(-rate_time / self.rate_smoothing)) if rate_time > 0 else 0.0
 
     def set_end_value(self, end: int) -> None:
         """Update the maximum value of the progress bar"""
@@ -52,75 +113,114 @@ class Progress:
     def start(self) -> None:
         """Start the progress bar"""
         Utility.hide_cursor()
+        Utility.get_terminal_size()  # Cache the size while on the main thread, which is notified of resizes
+        with self._state_lock:
+            self._finished_at = None
+            self._history.clear()
+            self._rate = 0.0
+            self._rate_time = 0.0
+            self._started_at = None
+            self._record_value(self._state[0])
         self._thread = StoppableThread(target=self._print, args=())
-        self._active = True
         self._thread.start()
 
     def stop(self) -> None:
-        """Stop the progress bar"""
-        sleep(1)
-        self._active = False
+        """Stop the progress bar, after drawing its final state"""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.join()
+            self._thread = None
         self._spinner_index = 0
-        self._thread.join()
         Utility.show_cursor()
 
     def terminate(self) -> None:
         """Terminate the progress bar.
             This method is generally used when the progress bar is needed to be stopped (e.g. on Ctrl+C)"""
-        sleep(1)
-        self._active = False
-        self._spinner_index = 0
-        self._thread.stop()
-        self._thread.join()
-        Utility.show_cursor()
+        self.stop()
+
+    def update(self, value: int, info_text: str) -> None:
+        """Update the value and the info text of the progress bar at once, from any thread"""
+        with self._state_lock:
+            self._state = (value, info_text)
+            self._record_value(value)
 
     def update_value(self, value: int) -> None:
-        """Update the value of the progress bar"""
-        self._value = value
+        """Update the value of the progress bar, from any thread"""
+        with self._state_lock:
+            self._state = (value, self._state[1])
+            self._record_value(value)
 
-    def _get_bar_full_width(self) -> int:
-        percentage = self._value * 100 / self._end
+    def _get_bar_full_width(self, value: int) -> int:
+        percentage = value * 100 / self._end
         bar_width = int(percentage * self._width / 100)
         return bar_width
 
-    def _get_progress_text(self) -> str:
-        percentage_value = self._value * 100 / self._end
-        percentage = self.percentage_renderer(PercentageRendererArgs(percentage_value, self._value))
+    def _get_next_frame(self) -> str:
+        # The renderers only run again when the state has changed. Otherwise, only the spinner moves,
+        # and the text of a complete bar, whose spinner stands still, is returned as it is.
+        value, info_text = self._state
+        key = (value, info_text, self._end, self.label, Utility.get_terminal_width(), int(self.elapsed))
+        complete = value >= self._end
+        if key == self._rendered_key and complete:
+            return self._frame
+        if key != self._rendered_key:
+            self._rendered_parts = self._get_progress_parts(value, info_text, key[4])
+            self._rendered_key = key
+        prefix, suffix = self._rendered_parts
+        percentage_value = value * 100 / self._end
         spinner_symbol = self.spinner_renderer(SpinnerRendererArgs(
             spinner=self._spinner[self._spinner_index % len(self._spinner)],
-            value=self._value,
+            value=value,
             percentage=percentage_value
         ))
-        bar_string = self._progress_bar_renderer()
+        self._frame = f"{prefix}{spinner_symbol}{suffix}"
+        if not complete:
+            self._spinner_index += 1
+        return self._frame
+
+    def _get_progress_parts(self, value: int, info_text: str, terminal_width: int) -> tuple[str, str]:
+        # The text before and after the spinner, without the info text, the rate and the label, in this order,
+        # while they do not fit
+        percentage_value = value * 100 / self._end
+        percentage = self.percentage_renderer(PercentageRendererArgs(percentage_value, value))
         bar = self.progress_bar_renderer(ProgressBarRendererArgs(
             percentage=percentage_value,
-            text=bar_string,
-            value=self._value,
-            width=self._get_bar_full_width()
+            text=self._progress_bar_renderer(value),
+            value=value,
+            width=self._get_bar_full_width(value)
         ))
         label = self.label_renderer(LabelRendererArgs(
             label=self.label,
-            value=self._value,
+            value=value,
             percentage=percentage_value
         ))
         separator = self.info_separator_renderer(InfoSeparatorRendererArgs(
             separator=self.info_separator,
-            value=self._value,
+            value=value,
             percentage=percentage_value
         ))
         info_text = self.info_text_renderer(InfoTextRendererArgs(
-            text=self.info_text,
-            value=self._value,
+            text=info_text,
+            value=value,
             percentage=percentage_value
         ))
-        progress_text = str.format("{}{} {} {}{}{}", label, bar, spinner_symbol, percentage, separator,
-                                   info_text)
-        text_length = len(Printer.strip_colors(progress_text))
-        if text_length > Utility.get_terminal_width():
-            progress_text = str.format("{}{} {} {}{}", label, bar, spinner_symbol, percentage, '')
-            if text_length > Utility.get_terminal_width():
-                progress_text = str.format("{}{} {} {}{}", '', bar, spinner_symbol, percentage, '')
-        return progress_text
+        rate = self.rate_renderer(RateRendererArgs(
+            rate=self.rate,
+            eta=self.eta,
+            elapsed=self.elapsed,
+            value=value,
+            percentage=percentage_value
+        ))
+        available_width = terminal_width - DisplayWidth.of(self._spinner[0])
+        prefix = f"{label}{bar} "
+        suffix = f" {percentage}{rate}{separator}{info_text}"
+        if AnsiText.width(prefix) + AnsiText.width(suffix) > available_width:
+            suffix = f" {percentage}{rate}"
+            if AnsiText.width(prefix) + AnsiText.width(suffix) > available_width:
+                suffix = f" {percentage}"
+                if AnsiText.width(prefix) + AnsiText.width(suffix) > available_width:
+                    prefix = f"{bar} "
+        return prefix, suffix
 
     def _info_separator_renderer(self) -> str:
         return self.info_separator if len(self.info_text) > 0 else ""
@@ -130,19 +230,42 @@ class Progress:
         return info_text
 
     def _print(self) -> None:
-        while self._active:
-            progress_text = self._get_progress_text()
-            self._spinner_index += 1
-            sys.stdout.write(
-                u"\u001b[K")  # Erase from cursor to end of line [http://matthieu.benoit.free.fr/68hc11/vt100.htm]
-            sys.stdout.write(
-                u"\u001b[1000D" + progress_text)  # Move terminal cursor 1000 characters left (go to start of line)
-            sys.stdout.flush()
-            sleep(self._interval)
-
-    def _progress_bar_renderer(self) -> str:
+        # A frame is drawn right away and then at every interval, until the thread is stopped.
+        # The stop wakes the thread up immediately, and the final state is drawn before it exits.
+        printed_text = self._print_frame(None)
+        while not self._thread.wait(self._interval):
+            printed_text = self._print_frame(printed_text)
+        self._print_frame(printed_text)
+        Printer.flush()
+
+    def _print_frame(self, printed_text: str | None) -> str:
+        progress_text = self._get_next_frame()
+        if progress_text is not printed_text:  # Nothing is written while the frame stays the same
+            # Erase from cursor to end of line [http://matthieu.benoit.free.fr/68hc11/vt100.htm],
+            # then move terminal cursor 1000 characters left (go to start of line)
+            Printer.write(u"\u001b[K" + u"\u001b[1000D" + progress_text)
+        return progress_text
+
+    def _progress_bar_renderer(self, value: int) -> str:
         bar_start = "⟪"
         bar_end = "⟫"
-        width = self._get_bar_full_width()
+        width = self._get_bar_full_width(value)
         bar = bar_start + "◆" * int(width) + " " * int((self._width - width)) + bar_end
         return bar
+
+    def _record_value(self, value: int) -> None:
+        # Called with the state lock held. The rate over the window of the history is averaged exponentially,
+        # weighted by the time since the previous value, so that frequent updates do not make it jumpy.
+        now = monotonic()
+        history = self._history
+        if len(history) > 0:
+            first_time, first_value = history[0]
+            if now > first_time:
+                window_rate = (value - first_value) / (now - first_time)
+                weight = 1 - math.exp((history[-1][0] - now) / self.rate_smoothing)
+                self._rate += weight * (window_rate - self._rate)
+                self._rate_time = now - self._started_at
+        else:
+            self._started_at = now
+        history.append((now, value))
+        self._finished_at = now if value >= self._end else None
@@ -36,6 +36,13 @@ class ProgressBarRendererArgs(BaseRendererArgs):
     width: int
 
 
+@dataclass
+class RateRendererArgs(BaseRendererArgs):
+    rate: float
+    eta: float | None
+    elapsed: float
+
+
 @dataclass
 class SpinnerRendererArgs(BaseRendererArgs):
     spinner: str
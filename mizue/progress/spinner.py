@@ -1,34 +1,29 @@
-from sys import stdout
-from time import sleep
+from mizue.printer import Printer
 from mizue.util import Utility
-from threading import Thread
+from mizue.util.stoppable_thread import StoppableThread
 
 
 class Spinner:
     def __init__(self):
         self._symbols = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        self._spinning = False
-        self._thread = None
+        self._thread: StoppableThread | None = None
 
     def _spin(self) -> None:
         index = 0
-        while self._spinning:
+        while True:
             spin_symbol = self._symbols[index % len(self._symbols)]
-            stdout.write(u"\u001b[1D" + spin_symbol)
-            stdout.flush()
+            Printer.write(u"\u001b[1D" + spin_symbol)
             index += 1
-            sleep(0.1)
+            if self._thread.wait(0.1):  # Woken up as soon as the spinner is stopped
+                break
 
     def start(self) -> None:
         Utility.hide_cursor()
-        self._spinning = True
-        self._thread = Thread(target=self._spin)
+        self._thread = StoppableThread(target=self._spin)
         self._thread.start()
 
     def stop(self) -> None:
-        sleep(0.3)
-        self._spinning = False
+        self._thread.stop()
         self._thread.join()
-        stdout.write(u"\u001b[1D")
-        stdout.flush()
+        Printer.write(u"\u001b[1D")
         Utility.show_cursor()
\ No newline at end of file
@@ -1,6 +1,9 @@
+from .cancellation_token import CancellationToken, OperationCancelledError
 from .event_listener import EventListener
+from .line_redraw import LineRedraw
 from .utility import Utility
 from .stoppable_thread import StoppableThread
 from .signal_handler import SignalHandler
 
-__all__ = ["EventListener", "Utility", "StoppableThread", "SignalHandler"]
+__all__ = ["CancellationToken", "EventListener", "LineRedraw", "OperationCancelledError", "Utility",
+           "StoppableThread", "SignalHandler"]
@@ -0,0 +1,22 @@
+import os
+
+from mizue.printer import Printer
+from .terminal_backend import TerminalBackend
+
+
+class AnsiTerminalBackend(TerminalBackend):
+    """
+    Controls POSIX terminals with ANSI escape sequences.
+    The sequences are written through the sink of Printer, so that they reach the terminal in order with the text.
+    """
+
+    def hide_cursor(self) -> None:
+        Printer.write("\x1b[?25l")
+        Printer.flush()
+
+    def is_elevated(self) -> bool:
+        return os.geteuid() == 0
+
+    def show_cursor(self) -> None:
+        Printer.write("\x1b[?25h")
+        Printer.flush()
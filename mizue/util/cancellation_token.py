@@ -0,0 +1,70 @@
+from threading import Event, Lock
+from typing import Callable
+
+
+class OperationCancelledError(Exception):
+    """Raised when an operation is cancelled through a CancellationToken"""
+    pass
+
+
+class CancellationToken:
+    """A thread-safe token used to cooperatively cancel long-running operations"""
+
+    def __init__(self):
+        self._callback_id_counter: int = 0
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._event = Event()
+        self._lock = Lock()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether the token has been cancelled"""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the token and invoke the registered callbacks"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def raise_if_cancelled(self) -> None:
+        """Raise an OperationCancelledError if the token has been cancelled"""
+        if self._event.is_set():
+            raise OperationCancelledError("Operation cancelled")
+
+    def register(self, callback: Callable[[], None]) -> int:
+        """
+        Register a callback to be invoked when the token is cancelled.
+        If the token has already been cancelled, the callback is invoked immediately.
+        :param callback: The callback to invoke
+        :return: The id of the callback, which can be used to unregister it
+        """
+        with self._lock:
+            callback_id = self._callback_id_counter
+            self._callback_id_counter += 1
+            if not self._event.is_set():
+                self._callbacks[callback_id] = callback
+                return callback_id
+        callback()
+        return callback_id
+
+    def unregister(self, callback_id: int) -> None:
+        """Unregister a callback"""
+        with self._lock:
+            self._callbacks.pop(callback_id, None)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until the token is cancelled or the timeout expires
+        :param timeout: The timeout in seconds, or None to wait indefinitely
+        :return: Whether the token has been cancelled
+        """
+        return self._event.wait(timeout)
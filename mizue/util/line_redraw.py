@@ -0,0 +1,32 @@
+class LineRedraw:
+    """
+    Rewrites some lines of a block of text that is already on the terminal, such as a table or stacked progress bars.
+
+    The cursor rests on the line below the block. It moves up to each changed line in order, rewrites it,
+    and finally goes back below the block, so the unchanged lines are not written at all.
+    """
+
+    @staticmethod
+    def get_sequence(changes: list[tuple[int, str]], height: int, first_visible_line: int = 0) -> str:
+        """
+        Build the escape sequence that rewrites the changed lines of a block
+        :param changes: The line number and the new text of every changed line, sorted by line number
+        :param height: The number of lines of the block
+        :param first_visible_line: The first line that the cursor can reach. The lines above it have scrolled out
+            of the screen, and their changes are skipped.
+        :return: The escape sequence, which leaves the cursor below the block
+        """
+        current_line = height
+        parts = []
+        for line_number, line in changes:
+            if line_number < first_visible_line:
+                continue
+            if line_number < current_line:
+                parts.append(f"\x1b[{current_line - line_number}F")
+            elif line_number > current_line:
+                parts.append(f"\x1b[{line_number - current_line}E")
+            parts.append(f"\r{line}\x1b[K")
+            current_line = line_number
+        if current_line < height:
+            parts.append(f"\x1b[{height - current_line}E")
+        return "".join(parts)
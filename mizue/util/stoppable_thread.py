@@ -4,13 +4,14 @@ from threading import Thread, Event
 class StoppableThread(Thread):
     def __init__(self, target, args=()):
         super(StoppableThread, self).__init__(target=target, args=args)
-        self._stop_event = None
+        self._stop_event = Event()
 
     def stop(self) -> None:
         self._stop_event.set()
 
-    def _init_stop_event(self) -> None:
-        self._stop_event = Event()
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until the thread is asked to stop or the timeout expires. Returns whether the thread is stopped."""
+        return self._stop_event.wait(timeout)
 
     def _is_stopped(self) -> bool:
         return self._stop_event.is_set()
@@ -0,0 +1,22 @@
+class TerminalBackend:
+    """
+    The platform-specific part of Utility.
+
+    This base class is used where the platform is unknown: it controls nothing and reports nothing.
+    """
+
+    def hide_cursor(self) -> None:
+        """Hides the cursor of the terminal."""
+        pass
+
+    def is_caps_lock_on(self) -> bool:
+        """Returns whether the caps lock key is on, or False if it cannot be known."""
+        return False
+
+    def is_elevated(self) -> bool:
+        """Returns whether the current process is elevated."""
+        return False
+
+    def show_cursor(self) -> None:
+        """Shows the cursor of the terminal."""
+        pass
@@ -1,17 +1,38 @@
-import ctypes
+import atexit
+import os
 import shutil
+import signal
+import sys
+import threading
 
-
-class _CursorInfo(ctypes.Structure):
-    _fields_ = [("size", ctypes.c_int), ("visible", ctypes.c_byte)]
+from .ansi_terminal_backend import AnsiTerminalBackend
+from .terminal_backend import TerminalBackend
+from .win32_terminal_backend import Win32TerminalBackend
 
 
 class Utility:
+    _backend: TerminalBackend = Win32TerminalBackend() if sys.platform == "win32" \
+        else AnsiTerminalBackend() if os.name == "posix" else TerminalBackend()
+    """The terminal backend of the platform, detected once when the module is imported"""
+
+    _is_cursor_hidden = False
+    _is_restoring_cursor = False
+    _is_watching_resizes = False
+    _terminal_size: os.terminal_size | None = None
+    """The cached size of the terminal, cleared when the terminal is resized"""
 
     @staticmethod
     def get_terminal_size() -> tuple[int, int]:
-        """Returns the size of the terminal."""
-        return shutil.get_terminal_size()
+        """
+        Returns the size of the terminal.
+        Where the terminal notifies resizes (SIGWINCH), the size is cached until the next resize.
+        """
+        size = Utility._terminal_size
+        if size is None:
+            size = shutil.get_terminal_size()
+            if Utility._watch_terminal_resizes():
+                Utility._terminal_size = size
+        return size
 
     @staticmethod
     def get_terminal_width() -> int:
@@ -25,24 +46,95 @@ class Utility:
 
     @staticmethod
     def hide_cursor() -> None:
-        """Hides the cursor."""
-        info = _CursorInfo()
-        info.visible = False
-        ctypes.windll.kernel32.SetConsoleCursorInfo(ctypes.windll.kernel32.GetStdHandle(-11), ctypes.byref(info))
+        """
+        Hides the cursor, if the output is a terminal.
+        The cursor is shown again when the program exits or is terminated by a signal.
+        """
+        if not Utility._is_terminal():
+            return
+        Utility._restore_cursor_on_exit()
+        Utility._backend.hide_cursor()
+        Utility._is_cursor_hidden = True
 
     @staticmethod
     def is_elevated() -> bool:
         """Returns whether the current process is elevated."""
-        return ctypes.windll.shell32.IsUserAnAdmin() != 0
+        return Utility._backend.is_elevated()
 
     @staticmethod
     def is_caps_lock_on() -> bool:
         """Returns whether the caps lock key is on."""
-        return ctypes.windll.user32.GetKeyState(0x14) != 0
+        return Utility._backend.is_caps_lock_on()
 
     @staticmethod
     def show_cursor() -> None:
-        """Shows the cursor."""
-        info = _CursorInfo()
-        info.visible = True
-        ctypes.windll.kernel32.SetConsoleCursorInfo(ctypes.windll.kernel32.GetStdHandle(-11), ctypes.byref(info))
+        """Shows the cursor, if the output is a terminal."""
+        if not Utility._is_terminal():
+            return
+        Utility._backend.show_cursor()
+        Utility._is_cursor_hidden = False
+
+    @staticmethod
+    def _is_terminal() -> bool:
+        try:
+            return sys.stdout.isatty()
+        except (AttributeError, ValueError):  # No standard output, or it has been closed
+            return False
+
+    @staticmethod
+    def _restore_cursor() -> None:
+        if Utility._is_cursor_hidden:
+            Utility.show_cursor()
+
+    @staticmethod
+    def _restore_cursor_on_exit() -> None:
+        # The cursor is restored at exit and before the signals that terminate the program without running atexit
+        # are handled as they were. Signal handlers can only be installed from the main thread.
+        if Utility._is_restoring_cursor:
+            return
+        Utility._is_restoring_cursor = True
+        atexit.register(Utility._restore_cursor)
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for name in ("SIGHUP", "SIGTERM"):
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            previous_handler = signal.getsignal(signum)
+            if previous_handler is signal.SIG_IGN:
+                continue
+
+            def on_signal(received_signum, frame, previous_handler=previous_handler):
+                Utility._restore_cursor()
+                if callable(previous_handler):
+                    previous_handler(received_signum, frame)
+                else:  # Run the default action, which terminates the program
+                    signal.signal(received_signum, signal.SIG_DFL)
+                    os.kill(os.getpid(), received_signum)
+
+            try:
+                signal.signal(signum, on_signal)
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def _watch_terminal_resizes() -> bool:
+        # SIGWINCH does not exist on Windows, and signal handlers can only be installed from the main thread.
+        # Until the handler is installed, the size is not cached.
+        if Utility._is_watching_resizes:
+            return True
+        if not hasattr(signal, "SIGWINCH") or threading.current_thread() is not threading.main_thread():
+            return False
+        previous_handler = signal.getsignal(signal.SIGWINCH)
+
+        def on_resize(signum, frame):
+            Utility._terminal_size = None
+            if callable(previous_handler):
+                previous_handler(signum, frame)
+
+        try:
+            signal.signal(signal.SIGWINCH, on_resize)
+        except ValueError:
+            return False
+        Utility._is_watching_resizes = True
+        return True
@@ -0,0 +1,38 @@
+import ctypes
+
+from mizue.printer import Printer
+from .terminal_backend import TerminalBackend
+
+_STD_OUTPUT_HANDLE = -11
+_VK_CAPITAL = 0x14
+
+
+class _CursorInfo(ctypes.Structure):
+    _fields_ = [("size", ctypes.c_int), ("visible", ctypes.c_byte)]
+
+
+class Win32TerminalBackend(TerminalBackend):
+    """Controls the Windows console with the Win32 API"""
+
+    def hide_cursor(self) -> None:
+        self._set_cursor_visibility(False)
+
+    def is_caps_lock_on(self) -> bool:
+        return ctypes.windll.user32.GetKeyState(_VK_CAPITAL) != 0
+
+    def is_elevated(self) -> bool:
+        return ctypes.windll.shell32.IsUserAnAdmin() != 0
+
+    def show_cursor(self) -> None:
+        self._set_cursor_visibility(True)
+
+    @staticmethod
+    def _set_cursor_visibility(visible: bool) -> None:
+        # The pending text is written first, since the console API changes the cursor immediately.
+        # The size of the cursor is kept: SetConsoleCursorInfo rejects a size of zero.
+        Printer.flush()
+        handle = ctypes.windll.kernel32.GetStdHandle(_STD_OUTPUT_HANDLE)
+        info = _CursorInfo()
+        ctypes.windll.kernel32.GetConsoleCursorInfo(handle, ctypes.byref(info))
+        info.visible = visible
+        ctypes.windll.kernel32.SetConsoleCursorInfo(handle, ctypes.byref(info))